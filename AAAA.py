@@ -5,10 +5,15 @@ LoopNet minimal flow:
 3) Query /loopnet/sale/advanceSearch with all filters
 4) Display results in a clean, readable format
 """
-import os, json, httpx
+import os, sys, json, asyncio, functools, httpx
 from pathlib import Path
 from dotenv import load_dotenv
 
+try:  # optional C-accelerated JSON; stdlib json is the fallback
+    import orjson
+except ImportError:
+    orjson = None
+
 load_dotenv()
 RAPIDAPI_KEY = os.getenv("RAPIDAPI_KEY")
 HEADERS = {
@@ -20,6 +25,30 @@ HEADERS = {
 FIND_CITY_URL = "https://loopnet-api.p.rapidapi.com/loopnet/helper/findCity"
 SEARCH_URL    = "https://loopnet-api.p.rapidapi.com/loopnet/sale/advanceSearch"
 FILTERS_FILE = Path(__file__).parent / "config" / "filters.json"
+CITY_CACHE_FILE = Path(__file__).parent / ".cache" / "cities.json"
+
+# URL slug: spaces -> dashes, commas dropped, in one C-level pass
+_SLUG_TABLE = str.maketrans({" ": "-", ",": None})
+
+# HTTP/2 lets findCity + advanceSearch multiplex over one TLS session (needs `httpx[http2]`)
+try:
+    import h2  # noqa: F401
+    HTTP2 = True
+except ImportError:
+    HTTP2 = False
+LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=20)
+
+def _loads(data: bytes):
+    return orjson.loads(data) if orjson else json.loads(data)
+
+def _pretty(obj) -> str:
+    if orjson:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode()
+    return json.dumps(obj, indent=2)
+
+def get_client() -> httpx.AsyncClient:
+    """Shared client so findCity + advanceSearch reuse one connection pool."""
+    return httpx.AsyncClient(headers=HEADERS, timeout=30, http2=HTTP2, limits=LIMITS)
 
 def fmt_price(item: dict) -> str:
     # Prefer numeric; fallback to marketing string
@@ -37,99 +66,127 @@ def fmt_address(item: dict) -> str:
     # Some payloads have 'address' in later endpoints—fallback:
     return item.get("address") or "N/A"
 
-def resolve_city_id(keywords: str) -> tuple[str, str]:
-    """Return (locationId, display) from /helper/findCity."""
+def _load_city_cache() -> dict:
+    """Load persisted city -> [locationId, display] pairs (empty when absent/corrupt)."""
+    try:
+        return json.loads(CITY_CACHE_FILE.read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError):
+        return {}
+
+_CITY_CACHE = _load_city_cache()
+
+async def resolve_city_id(client: httpx.AsyncClient, keywords: str) -> tuple[str, str]:
+    """Return (locationId, display) from /helper/findCity, cached on disk per city."""
+    key = keywords.strip().lower()
+    if key in _CITY_CACHE:
+        location_id, display = _CITY_CACHE[key]
+        return location_id, display
+
     payload = {"keywords": keywords}
-    r = httpx.post(FIND_CITY_URL, headers=HEADERS, json=payload, timeout=30)
+    r = await client.post(FIND_CITY_URL, json=payload)
     r.raise_for_status()
-    body = r.json()
+    body = _loads(r.content)
     arr = (body or {}).get("data") or []
     if not arr:
         raise RuntimeError(f"No city results for '{keywords}'")
     # Pick the best match: first exact match if present, else first item
     exact = next((x for x in arr if x.get("display", "").lower().startswith(keywords.lower())), None)
     best = exact or arr[0]
-    return best.get("id"), best.get("display")
+    location_id, display = best.get("id"), best.get("display")
+
+    # Write-through so the next run skips the findCity round-trip
+    _CITY_CACHE[key] = [location_id, display]
+    CITY_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+    CITY_CACHE_FILE.write_text(json.dumps(_CITY_CACHE, indent=2), encoding="utf-8")
+    return location_id, display
+
+async def resolve_city_ids(client: httpx.AsyncClient, keywords: list[str]) -> list[tuple[str, str]]:
+    """Resolve several cities concurrently over the shared client."""
+    return await asyncio.gather(*(resolve_city_id(client, k) for k in keywords))
+
+@functools.lru_cache(maxsize=1)
+def _load_filters(mtime: float) -> dict:
+    """Parse filters.json; keyed on mtime so edits invalidate the cache."""
+    with open(FILTERS_FILE, 'r') as f:
+        return json.load(f)
 
 def load_filters_from_file() -> dict:
     """Load filters from config/filters.json."""
     if not FILTERS_FILE.exists():
         raise FileNotFoundError(f"Filters file not found: {FILTERS_FILE}")
-    with open(FILTERS_FILE, 'r') as f:
-        return json.load(f)
+    return dict(_load_filters(FILTERS_FILE.stat().st_mtime))
 
-def search_listings(filters: dict):
+async def search_listings(client: httpx.AsyncClient, filters: dict):
     """
     Search LoopNet using filters from config/filters.json.
     If cityName is present, resolve it to locationId first.
     """
-    # Make a copy to avoid modifying the original
-    payload = filters.copy()
+    # Single pass: drop nulls and cityName (resolved separately below)
+    payload = {k: v for k, v in filters.items() if v is not None and k != "cityName"}
     
     # If cityName is provided, resolve it to locationId
-    if "cityName" in payload:
-        city_name = payload.pop("cityName")
+    city_name = filters.get("cityName")
+    if city_name is not None:
         print(f"🔍 Resolving city: {city_name}")
-        location_id, display = resolve_city_id(city_name)
+        location_id, display = await resolve_city_id(client, city_name)
         print(f"   ✅ Found: {display} -> locationId={location_id}")
         payload["locationId"] = location_id
     
-    # Remove any null values for cleaner API request
-    payload = {k: v for k, v in payload.items() if v is not None}
-    
     print(f"\n📋 Request payload:")
-    print(json.dumps(payload, indent=2))
+    print(_pretty(payload))
     
-    r = httpx.post(SEARCH_URL, headers=HEADERS, json=payload, timeout=30)
+    r = await client.post(SEARCH_URL, json=payload)
     print(f"Status: {r.status_code}")
-    body = r.json()
+    body = _loads(r.content)
     
     # Show sample keys for debugging
     if (body.get("data") or []):
         print(f"✅ API returned {len(body['data'])} listings")
+    elif os.getenv("LOOPNET_DEBUG"):
+        print(f"⚠️  Response: {_pretty(body)}")
     else:
-        print(f"⚠️  Response: {json.dumps(body, indent=2)}")
+        print("⚠️  No listings returned (set LOOPNET_DEBUG=1 to dump the response)")
     
     return body
 
+# (label, output field, format) — the value sits just before its label in nested fact arrays
+_FACT_KEYS = (("Units", "units", "{}"), ("SF Bldg", "building_size", "{} SF"), ("Cap Rate", "cap_rate", "{}"))
+_NO_PREV = object()
+
+def _iter_facts(facts):
+    """Flatten shortPropertyFacts into (previous, current, nested) triples in one pass."""
+    for fact_group in facts:
+        if not isinstance(fact_group, list):
+            continue
+        for fact in fact_group:
+            if isinstance(fact, str):
+                yield _NO_PREV, fact, False
+            elif isinstance(fact, list):
+                prev = _NO_PREV
+                for field in fact:
+                    yield prev, field, True
+                    prev = field
+
 def extract_key_fields(item: dict) -> dict:
     """Extract and organize the most important fields from a listing."""
     facts = item.get('shortPropertyFacts', [])
     
     # Parse nested facts array for key metrics
-    cap_rate = "N/A"
-    units = "N/A"
-    building_size = "N/A"
-    year_built = "N/A"
+    out = {"cap_rate": "N/A", "units": "N/A", "building_size": "N/A", "year_built": "N/A"}
     
-    # The structure is nested arrays - flatten and search
-    for fact_group in facts:
-        if isinstance(fact_group, list):
-            for fact in fact_group:
-                if isinstance(fact, str):
-                    # Direct string matches
-                    if "%" in fact and "Cap" not in fact:
-                        cap_rate = fact
-                    elif "Built in" in fact:
-                        year_built = fact.replace("Built in ", "")
-                elif isinstance(fact, list):
-                    # Nested array - check each element
-                    for i, field in enumerate(fact):
-                        if isinstance(field, str):
-                            if "%" in field and "Cap" not in field:
-                                cap_rate = field
-                            elif "Units" in field:
-                                # Previous element is the number
-                                if i > 0:
-                                    units = str(fact[i-1])
-                            elif "SF Bldg" in field:
-                                # Previous element is the size
-                                if i > 0:
-                                    building_size = f"{fact[i-1]} SF"
-                            elif "Cap Rate" in field:
-                                # Previous element is the percentage
-                                if i > 0:
-                                    cap_rate = str(fact[i-1])
+    for prev, fact, nested in _iter_facts(facts):
+        if not isinstance(fact, str):
+            continue
+        if "%" in fact and "Cap" not in fact:
+            out["cap_rate"] = fact
+        elif not nested:
+            if "Built in" in fact:
+                out["year_built"] = fact.replace("Built in ", "")
+        elif prev is not _NO_PREV:
+            for needle, field, fmt in _FACT_KEYS:
+                if needle in fact:
+                    out[field] = fmt.format(prev)
+                    break
     
     location = item.get('location', {})
     broker_details = item.get('brokersDetails', [{}])[0]
@@ -137,10 +194,10 @@ def extract_key_fields(item: dict) -> dict:
     return {
         'address': fmt_address(item),
         'price': fmt_price(item),
-        'cap_rate': cap_rate,
-        'units': units,
-        'building_size': building_size,
-        'year_built': year_built,
+        'cap_rate': out['cap_rate'],
+        'units': out['units'],
+        'building_size': out['building_size'],
+        'year_built': out['year_built'],
         'property_type': location.get('availableSpace', 'N/A'),
         'description': item.get('shortSummary', 'N/A'),
         'broker_name': item.get('brokerName', 'N/A'),
@@ -159,8 +216,8 @@ def print_results(body, label="results"):
         # Format: https://www.loopnet.com/Listing/[ADDRESS]/[LISTING_ID]/
         title = it.get('title', [])
         if isinstance(title, list) and len(title) >= 2:
-            street = title[0].replace(' ', '-').replace(',', '')
-            city_state = title[1].replace(' ', '-').replace(',', '')
+            street = title[0].translate(_SLUG_TABLE)
+            city_state = title[1].translate(_SLUG_TABLE)
             url = f"https://www.loopnet.com/Listing/{street}-{city_state}/{listing_id}/"
         else:
             url = f"https://www.loopnet.com/Listing/{listing_id}/"
@@ -168,25 +225,29 @@ def print_results(body, label="results"):
         # Extract key fields
         fields = extract_key_fields(it)
         
-        print(f"{'='*90}")
-        print(f"🏢 LISTING #{i}")
-        print(f"{'='*90}")
-        print(f"📍 Address:        {fields['address']}")
-        print(f"💰 Price:          {fields['price']}")
-        print(f"📊 Cap Rate:       {fields['cap_rate']}")
-        print(f"🏘️  Units:          {fields['units']}")
-        print(f"📐 Building Size:  {fields['building_size']}")
-        print(f"📅 Year Built:     {fields['year_built']}")
-        print(f"🏗️  Type:           {fields['property_type']}")
-        print(f"\n👔 Broker:         {fields['broker_name']}")
-        print(f"🏢 Company:        {fields['company']}")
-        print(f"\n� Listing URL:    {url}")
-        print(f"🖼️  Photo:          {fields['photo']}")
-        print(f"\n📝 Description:")
-        print(f"   {fields['description'][:200]}...")
-        print(f"{'='*90}\n")
+        # One write per listing instead of a print() (and syscall) per line
+        lines = [
+            f"{'='*90}",
+            f"🏢 LISTING #{i}",
+            f"{'='*90}",
+            f"📍 Address:        {fields['address']}",
+            f"💰 Price:          {fields['price']}",
+            f"📊 Cap Rate:       {fields['cap_rate']}",
+            f"🏘️  Units:          {fields['units']}",
+            f"📐 Building Size:  {fields['building_size']}",
+            f"📅 Year Built:     {fields['year_built']}",
+            f"🏗️  Type:           {fields['property_type']}",
+            f"\n👔 Broker:         {fields['broker_name']}",
+            f"🏢 Company:        {fields['company']}",
+            f"\n� Listing URL:    {url}",
+            f"🖼️  Photo:          {fields['photo']}",
+            f"\n📝 Description:",
+            f"   {fields['description'][:200]}...",
+            f"{'='*90}\n",
+        ]
+        sys.stdout.write("\n".join(lines) + "\n")
 
-def main():
+async def main():
     print("="*90)
     print("🧪 LOOPNET FLOW TEST - Loading filters from config/filters.json")
     print("="*90)
@@ -204,7 +265,8 @@ def main():
         
         # Search with loaded filters
         print(f"\n{'='*90}")
-        body = search_listings(filters)
+        async with get_client() as client:
+            body = await search_listings(client, filters)
         print(f"{'='*90}\n")
         
         # Display results
@@ -222,4 +284,4 @@ def main():
     print("\n" + "="*90 + "\n🏁 Done\n" + "="*90)
 
 if __name__ == "__main__":
-    main()
+    asyncio.run(main())
@@ -1,6 +1,7 @@
 """Vercel entrypoint exposing the FastAPI application."""
 from __future__ import annotations
 
+import logging
 import os
 import sys
 from pathlib import Path
@@ -18,4 +19,22 @@ if MODE in {"1", "true", "lite"}:
 else:
     from src.main import app  # noqa: E402
 
+
+def _warm_up() -> None:
+    """Build the OpenAPI schema and serve one request so the first real invocation is warm."""
+    from fastapi.testclient import TestClient
+
+    try:
+        app.openapi()
+        with TestClient(app) as client:
+            client.get("/health")
+    except Exception:  # warm-up is best effort; never block the import
+        logging.getLogger(__name__).warning("API warm-up failed", exc_info=True)
+
+
+# Vercel keeps a module loaded across invocations on the same instance, so pay
+# schema generation and first-request setup at import time instead of per request
+if os.getenv("VERCEL"):
+    _warm_up()
+
 __all__ = ["app"]
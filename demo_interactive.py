@@ -4,6 +4,7 @@ Demo of interactive analyzer with simulated user input
 """
 import subprocess
 import sys
+import threading
 
 # Simulate user input:
 # 1. Select listings: 1,2 (first two listings)
@@ -31,10 +32,23 @@ process = subprocess.Popen(
     stdin=subprocess.PIPE,
     stdout=subprocess.PIPE,
     stderr=subprocess.STDOUT,
-    text=True
+    text=True,
+    bufsize=1
 )
 
-output, _ = process.communicate(input=input_string, timeout=120)
-print(output)
+# Stop the analyzer if it is still running after 2 minutes
+watchdog = threading.Timer(120, process.kill)
+watchdog.start()
+
+process.stdin.write(input_string)
+process.stdin.close()
+
+# Echo output as the analyzer produces it instead of after it exits
+for line in process.stdout:
+    sys.stdout.write(line)
+    sys.stdout.flush()
+
+process.wait()
+watchdog.cancel()
 
 sys.exit(process.returncode)
@@ -4,7 +4,6 @@ Interactive Property Analyzer
 Allows user to select listings and agents before running expensive AI analysis.
 """
 import asyncio
-import json
 import os
 import sys
 from pathlib import Path
@@ -65,7 +64,12 @@ from rich.progress import (
 )
 
 console = Console()
-BASE_URL = "http://127.0.0.1:8000"
+
+# Persisted last run number inside outputs/ (avoids rescanning run directories)
+RUN_COUNTER_FILE = ".last_run"
+
+# Upper bound on listings analyzed at once (keeps LLM/API rate limits in check)
+ANALYSIS_CONCURRENCY = int(os.getenv("ANALYZER_CONCURRENCY", "4"))
 
 AGENT_LABELS = {
     "investment": ("💰", "Investment Agent"),
@@ -140,15 +144,10 @@ def display_la_city_summary(records: dict[str, Any]) -> None:
 
 from src.app.models import FinalReport, Listing
 from src.app.crew import PropertyAnalysisCrew
-
-
-def format_price(price: Optional[float]) -> str:
-    """Format price for display."""
-    if price is None:
-        return "N/A"
-    if price >= 1_000_000:
-        return f"${price/1_000_000:.2f}M"
-    return f"${price:,.0f}"
+from src.app.html_report import format_price, generate_html_report
+from src.app.serialization import write_json
+from src.app.loopnet_client import create_http_client
+from src.app.runtime import run
 
 
 def format_price_per_unit(price: Optional[float], units: Optional[int]) -> str:
@@ -165,49 +164,39 @@ def format_price_per_sf(price: Optional[float], size: Optional[float]) -> str:
     return f"${price/size:,.0f}/SF"
 
 
+# URL slug: spaces -> dashes, commas dropped, in one C-level pass
+_SLUG_TABLE = str.maketrans({" ": "-", ",": None})
+
+
 def build_loopnet_url(listing) -> str:
     """Build LoopNet URL from listing data."""
     listing_id = listing.listing_id
     
     # Try to build pretty URL with address
     if listing.address and listing.city and listing.state:
-        street = listing.address.replace(' ', '-').replace(',', '')
-        city_state = f"{listing.city}-{listing.state}".replace(' ', '-').replace(',', '')
+        street = listing.address.translate(_SLUG_TABLE)
+        city_state = f"{listing.city}-{listing.state}".translate(_SLUG_TABLE)
         return f"https://www.loopnet.com/Listing/{street}-{city_state}/{listing_id}/"
     
     # Fallback to simple URL
     return f"https://www.loopnet.com/Listing/{listing_id}/"
 
 
-async def fetch_listings():
-    """Fetch listings without running AI analysis."""
+async def fetch_listings(client: httpx.AsyncClient):
+    """Fetch listings without running AI analysis over a shared HTTP client."""
     console.print("\n[bold cyan]Step 1: Fetching listings from LoopNet...[/bold cyan]")
 
     from src.app.filters import load_filters, load_city_name
     from src.app.loopnet_client import LoopNetClient, LoopNetAPIError
-    from src.app.models import SearchParams
 
-    filters_dict: dict[str, object]
+    # Read config/filters.json directly; the API server's /filters serves the same file
+    params = load_filters()
     city_name = load_city_name()
-
-    try:
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.get(f"{BASE_URL}/filters")
-            response.raise_for_status()
-            payload = response.json()
-            filters_dict = {k: v for k, v in payload.items() if k != "cityName"}
-            city_name = city_name or payload.get("cityName")
-            console.print("[dim]Loaded filters from running API server[/dim]")
-    except (httpx.HTTPError, OSError):
-        stored = load_filters()
-        filters_dict = stored.model_dump(exclude_none=True)
-        console.print("[dim]API server not reachable; using stored filters locally[/dim]")
+    console.print("[dim]Loaded filters from config/filters.json[/dim]")
 
     if city_name:
         console.print(f"[dim]City: {city_name}[/dim]")
 
-    params = SearchParams(**filters_dict)
-
     def _has_numeric_location(value: str | None) -> bool:
         return value is not None and str(value).isdigit()
 
@@ -224,7 +213,7 @@ async def fetch_listings():
     else:
         console.print("[dim]No location supplied; running nationwide search[/dim]")
 
-    client_ln = LoopNetClient()
+    client_ln = LoopNetClient(http=client)
     try:
         listings = await client_ln.search_properties(params, city_name=city_for_request)
     except LoopNetAPIError as exc:
@@ -260,24 +249,24 @@ def display_listings(listings):
     table.add_column("Size (SF)", justify="right")
     table.add_column("Price Ratios", justify="left", width=16)
     
-    for idx, listing in enumerate(listings, 1):
-        cap_rate = f"{listing.cap_rate:.2f}%" if listing.cap_rate else "N/A"
-        units = str(listing.units) if listing.units else "N/A"
-        size = f"{listing.building_size:,.0f}" if listing.building_size else "N/A"
-        per_unit = format_price_per_unit(listing.ask_price, listing.units)
-        per_sf = format_price_per_sf(listing.ask_price, listing.building_size)
-        ratios = f"{per_unit}\n{per_sf}"
-        
-        table.add_row(
+    # Format every row up front, then hand them to rich in one tight loop
+    fmt_price, per_unit, per_sf = format_price, format_price_per_unit, format_price_per_sf
+    rows = [
+        (
             str(idx),
             listing.address or "No address",
             listing.state or "N/A",
-            format_price(listing.ask_price),
-            cap_rate,
-            units,
-            size,
-            ratios,
+            fmt_price(listing.ask_price),
+            f"{listing.cap_rate:.2f}%" if listing.cap_rate else "N/A",
+            str(listing.units) if listing.units else "N/A",
+            f"{listing.building_size:,.0f}" if listing.building_size else "N/A",
+            f"{per_unit(listing.ask_price, listing.units)}\n"
+            f"{per_sf(listing.ask_price, listing.building_size)}",
         )
+        for idx, listing in enumerate(listings, 1)
+    ]
+    for row in rows:
+        table.add_row(*row)
     
     console.print(table)
 
@@ -341,14 +330,12 @@ def select_agents_for_listing(listing, listing_num):
             console.print("[red]Invalid input. Please enter numbers separated by commas.[/red]")
 
 
-def get_next_run_number(outputs_dir: Path) -> int:
-    """Get the next run number by checking existing run directories."""
+def _scan_last_run_number(outputs_dir: Path) -> int:
+    """Find the highest existing run number by scanning run directories."""
     if not outputs_dir.exists():
-        return 1
+        return 0
     
     existing_runs = [d.name for d in outputs_dir.iterdir() if d.is_dir() and d.name.startswith("run")]
-    if not existing_runs:
-        return 1
     
     # Extract numbers from run directories (e.g., "run1" -> 1)
     run_numbers = []
@@ -359,7 +346,87 @@ def get_next_run_number(outputs_dir: Path) -> int:
         except ValueError:
             continue
     
-    return max(run_numbers) + 1 if run_numbers else 1
+    return max(run_numbers) if run_numbers else 0
+
+
+def get_next_run_number(outputs_dir: Path) -> int:
+    """Get the next run number from the outputs/.last_run counter and bump it."""
+    counter = outputs_dir / RUN_COUNTER_FILE
+    try:
+        last = int(counter.read_text(encoding="utf-8").strip() or 0)
+    except (OSError, ValueError):
+        # Bootstrap (or repair) the counter from existing run directories
+        last = _scan_last_run_number(outputs_dir)
+
+    next_number = last + 1
+    # Guard against run directories created without going through the counter
+    while (outputs_dir / f"run{next_number}").exists():
+        next_number += 1
+
+    outputs_dir.mkdir(parents=True, exist_ok=True)
+    tmp = counter.with_suffix(".tmp")
+    tmp.write_text(str(next_number), encoding="utf-8")
+    os.replace(tmp, counter)
+    return next_number
+
+
+def _write_markdown(
+    md_path: Path,
+    report: FinalReport,
+    enabled_agents,
+    la_city_records: Optional[dict[str, Any]],
+) -> None:
+    """Write the human-readable markdown report (runs in a worker thread)."""
+    parts: list[str] = []
+    add = parts.append
+    add(f"# Property Analysis: {report.address}\n\n")
+    add(f"**Listing ID:** {report.listing_id}\n")
+    add(f"**Price:** {format_price(report.ask_price)}\n")
+    add(f"**Overall Score:** {report.scores.overall}/100\n\n")
+    add("---\n\n")
+
+    for key, heading, output, score in (
+        ("investment", "💰 Investment Agent", report.investment_output, report.scores.investment),
+        ("location", "📍 Location Risk Agent", report.location_output, report.scores.location),
+        ("news", "📰 News/Reddit Agent", report.news_output, report.scores.news_signal),
+        ("vc_risk", "📊 VC Risk/Return Agent", report.vc_risk_output, report.scores.risk_return),
+        ("construction", "🏗️ Construction Agent", report.construction_output, report.scores.construction),
+    ):
+        if output and key in enabled_agents:
+            add(f"## {heading} (Score: {score}/100)\n\n")
+            add(f"**Rationale:** {output.rationale}\n\n")
+            add("**Key Notes:**\n")
+            parts.extend(f"- {note}\n" for note in output.notes)
+            add("\n---\n\n")
+
+    if la_city_records is not None:
+        counts = (la_city_records.get("meta") or {}).get("counts") or {}
+        errors = la_city_records.get("errors") or {}
+
+        add("## 🏛️ LA City Records\n\n")
+        add("| Dataset | Records |\n")
+        add("| --- | ---: |\n")
+        parts.extend(f"| {label} | {counts.get(key, 0)} |\n" for key, label in LA_DATASET_LABELS.items())
+
+        if errors:
+            add("\n**Warnings:**\n")
+            parts.extend(
+                f"- {LA_DATASET_LABELS.get(key, key)}: {message}\n" for key, message in errors.items()
+            )
+            add("\n")
+
+    # Consolidated Memo
+    add("## 📝 Investment Memo\n\n")
+    add(report.memo_markdown)
+
+    # One write instead of dozens of small buffered writes
+    md_path.write_text("".join(parts), encoding="utf-8")
+
+
+def _write_outputs(writes: list[tuple]) -> None:
+    """Run a listing's file writers back to back (called from a worker thread)."""
+    for writer, *args in writes:
+        writer(*args)
 
 
 async def analyze_listing_with_agents(
@@ -406,102 +473,27 @@ async def analyze_listing_with_agents(
 
     # Save report to run directory
     run_dir.mkdir(parents=True, exist_ok=True)
-    
-    # Save JSON
     json_path = run_dir / f"{report.listing_id}.json"
-    payload = report.model_dump()
+    md_path = run_dir / f"{report.listing_id}.md"
+    html_path = run_dir / f"{report.listing_id}.html"
+
+    payload = report.model_dump(mode="json")
     if la_city_records is not None:
         payload["la_city_records"] = la_city_records
 
-    with open(json_path, "w", encoding="utf-8") as f:
-        json.dump(payload, f, indent=2)
-    
-    # Save human-readable markdown
-    md_path = run_dir / f"{report.listing_id}.md"
-    with open(md_path, "w", encoding="utf-8") as f:
-        f.write(f"# Property Analysis: {report.address}\n\n")
-        f.write(f"**Listing ID:** {report.listing_id}\n")
-        f.write(f"**Price:** {format_price(report.ask_price)}\n")
-        f.write(f"**Overall Score:** {report.scores.overall}/100\n\n")
-        f.write("---\n\n")
-        
-        # Investment Agent
-        if report.investment_output and "investment" in enabled_agents:
-            f.write(f"## 💰 Investment Agent (Score: {report.scores.investment}/100)\n\n")
-            f.write(f"**Rationale:** {report.investment_output.rationale}\n\n")
-            f.write("**Key Notes:**\n")
-            for note in report.investment_output.notes:
-                f.write(f"- {note}\n")
-            f.write("\n---\n\n")
-        
-        # Location Agent
-        if report.location_output and "location" in enabled_agents:
-            f.write(f"## 📍 Location Risk Agent (Score: {report.scores.location}/100)\n\n")
-            f.write(f"**Rationale:** {report.location_output.rationale}\n\n")
-            f.write("**Key Notes:**\n")
-            for note in report.location_output.notes:
-                f.write(f"- {note}\n")
-            f.write("\n---\n\n")
-        
-        # News Agent
-        if report.news_output and "news" in enabled_agents:
-            f.write(f"## 📰 News/Reddit Agent (Score: {report.scores.news_signal}/100)\n\n")
-            f.write(f"**Rationale:** {report.news_output.rationale}\n\n")
-            f.write("**Key Notes:**\n")
-            for note in report.news_output.notes:
-                f.write(f"- {note}\n")
-            f.write("\n---\n\n")
-        
-        # VC Risk Agent
-        if report.vc_risk_output and "vc_risk" in enabled_agents:
-            f.write(f"## 📊 VC Risk/Return Agent (Score: {report.scores.risk_return}/100)\n\n")
-            f.write(f"**Rationale:** {report.vc_risk_output.rationale}\n\n")
-            f.write("**Key Notes:**\n")
-            for note in report.vc_risk_output.notes:
-                f.write(f"- {note}\n")
-            f.write("\n---\n\n")
-        
-        # Construction Agent
-        if report.construction_output and "construction" in enabled_agents:
-            f.write(f"## 🏗️ Construction Agent (Score: {report.scores.construction}/100)\n\n")
-            f.write(f"**Rationale:** {report.construction_output.rationale}\n\n")
-            f.write("**Key Notes:**\n")
-            for note in report.construction_output.notes:
-                f.write(f"- {note}\n")
-            f.write("\n---\n\n")
-        
-        if la_city_records is not None:
-            counts = (la_city_records.get("meta") or {}).get("counts") or {}
-            errors = la_city_records.get("errors") or {}
-
-            f.write("## 🏛️ LA City Records\n\n")
-            f.write("| Dataset | Records |\n")
-            f.write("| --- | ---: |\n")
-            for key, label in LA_DATASET_LABELS.items():
-                count = counts.get(key, 0)
-                f.write(f"| {label} | {count} |\n")
-
-            if errors:
-                f.write("\n**Warnings:**\n")
-                for key, message in errors.items():
-                    label = LA_DATASET_LABELS.get(key, key)
-                    f.write(f"- {label}: {message}\n")
-                f.write("\n")
-
-        # Consolidated Memo
-        f.write("## 📝 Investment Memo\n\n")
-        f.write(report.memo_markdown)
-    
-    # Generate HTML report for easy viewing
-    from src.app.html_report import generate_html_report
-    html_path = run_dir / f"{report.listing_id}.html"
-    generate_html_report(report, listing, html_path)
+    writes = [
+        (write_json, json_path, payload),
+        (_write_markdown, md_path, report, enabled_agents, la_city_records),
+        (generate_html_report, report, listing, html_path),
+    ]
 
     la_json_path: Optional[Path] = None
     if la_city_records is not None:
         la_json_path = run_dir / f"{report.listing_id}_la_city.json"
-        with open(la_json_path, "w", encoding="utf-8") as f:
-            json.dump(la_city_records, f, indent=2)
+        writes.append((write_json, la_json_path, la_city_records))
+
+    # One worker-thread hop per listing for all of its files keeps the event loop free
+    await asyncio.to_thread(_write_outputs, writes)
     
     console.print(f"[green]✓ Analysis complete for {listing.address}[/green]")
     console.print(f"[dim]  JSON: {json_path}[/dim]")
@@ -522,8 +514,9 @@ async def main():
     ))
     
     try:
-        # Step 1: Fetch listings
-        listings = await fetch_listings()
+        # Step 1: Fetch listings (one pooled client for every HTTP call in this step)
+        async with create_http_client() as http_client:
+            listings = await fetch_listings(http_client)
         
         if not listings:
             console.print("[red]No listings found. Check your filters in config/filters.json[/red]")
@@ -573,16 +566,43 @@ async def main():
             console=console,
         ) as progress:
             task_id = progress.add_task("Analyzing listings...", total=len(analysis_plan))
+            semaphore = asyncio.Semaphore(ANALYSIS_CONCURRENCY)
+
+            async def _run_one(idx: int, listing: Listing, agents: list[str]):
+                try:
+                    async with semaphore:
+                        progress.console.print(
+                            f"\n[bold]Listing {idx} of {len(analysis_plan)}:[/bold] {listing.address or listing.listing_id}"
+                        )
+                        # Concurrent listings must not share CrewAI agents (they carry run state)
+                        report, la_city_records = await analyze_listing_with_agents(
+                            crew.with_fresh_agents(), listing, agents, run_dir
+                        )
+                finally:
+                    progress.update(task_id, advance=1)
+                return report, listing, agents, la_city_records
+
+            # Listings are independent and network-bound, so analyze them concurrently;
+            # one failed listing should not discard the others
+            results = await asyncio.gather(
+                *(
+                    _run_one(idx, listing, agents)
+                    for idx, (listing, agents) in enumerate(analysis_plan, 1)
+                ),
+                return_exceptions=True,
+            )
 
-            for idx, (listing, agents) in enumerate(analysis_plan, 1):
-                progress.console.print(
-                    f"\n[bold]Listing {idx} of {len(analysis_plan)}:[/bold] {listing.address or listing.listing_id}"
-                )
-                report, la_city_records = await analyze_listing_with_agents(
-                    crew, listing, agents, run_dir
+        for (listing, _agents), result in zip(analysis_plan, results):
+            if isinstance(result, BaseException):
+                console.print(
+                    f"[red]✗ Analysis failed for {listing.address or listing.listing_id}: {result}[/red]"
                 )
-                reports.append((report, listing, agents, la_city_records))
-                progress.update(task_id, advance=1)
+            else:
+                reports.append(result)
+
+        if not reports:
+            console.print("\n[red]No listings were analyzed successfully.[/red]")
+            return 1
         
         # Step 5: Summary
         console.print("\n[bold green]✓ Analysis Complete![/bold green]\n")
@@ -600,27 +620,32 @@ async def main():
         summary_table.add_column("SF", justify="right", width=9)
         summary_table.add_column("Score", justify="center", style="yellow", width=8)
         
-        for report, listing, _agents, _la_data in reports:
-            cap_rate = f"{listing.cap_rate:.1f}%" if listing.cap_rate else "N/A"
-            units = str(listing.units) if listing.units else "N/A"
-            size = f"{listing.building_size:,.0f}" if listing.building_size else "N/A"
-            
-            summary_table.add_row(
+        fmt_price = format_price
+        summary_rows = [
+            (
                 report.address or "N/A",
-                format_price(listing.ask_price),
-                cap_rate,
-                units,
-                size,
-                f"{report.scores.overall}/100"
+                fmt_price(listing.ask_price),
+                f"{listing.cap_rate:.1f}%" if listing.cap_rate else "N/A",
+                str(listing.units) if listing.units else "N/A",
+                f"{listing.building_size:,.0f}" if listing.building_size else "N/A",
+                f"{report.scores.overall}/100",
             )
+            for report, listing, _agents, _la_data in reports
+        ]
+        for row in summary_rows:
+            summary_table.add_row(*row)
         
         console.print(summary_table)
         
         # Print URLs separately for better readability
-        console.print("\n[bold cyan]🔗 Property Links:[/bold cyan]")
-        for report, listing, _agents, _la_data in reports:
-            loopnet_url = build_loopnet_url(listing)
-            console.print(f"  • [cyan]{report.address}[/cyan]: [blue underline]{loopnet_url}[/blue underline]")
+        # One markup string -> one parse and one terminal write for the whole block
+        url_for = build_loopnet_url
+        link_lines = ["\n[bold cyan]🔗 Property Links:[/bold cyan]"]
+        link_lines.extend(
+            f"  • [cyan]{report.address}[/cyan]: [blue underline]{url_for(listing)}[/blue underline]"
+            for report, listing, _agents, _la_data in reports
+        )
+        console.print("\n".join(link_lines))
         
         console.print(f"\n[dim]📁 Reports saved to: {run_dir}[/dim]")
         any_la_records = any(la_data for *_rest, la_data in reports)
@@ -642,4 +667,4 @@ async def main():
 
 
 if __name__ == "__main__":
-    sys.exit(asyncio.run(main()))
+    sys.exit(run(main()))
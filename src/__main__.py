@@ -1,10 +1,11 @@
 """Convenience entry point for running default analysis."""
 from __future__ import annotations
 
-import asyncio
 import sys
 from types import SimpleNamespace
 
+from .app.config import settings
+from .app.runtime import run
 from .cli import analyze_command, main as cli_main
 
 
@@ -29,7 +30,9 @@ def _default_args() -> SimpleNamespace:
         exclude_pending_sales=None,
         use_stored=True,
         persist_filters=False,
+        batch_api=settings.use_batch_api,
         output_dir="./out",
+        concurrency=8,
     )
 
 
@@ -39,7 +42,7 @@ def main() -> None:
         cli_main()
         return
 
-    asyncio.run(analyze_command(_default_args()))
+    run(analyze_command(_default_args()))
 
 
 if __name__ == "__main__":
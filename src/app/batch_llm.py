@@ -0,0 +1,132 @@
+"""OpenAI Batch API helpers for bulk, non-interactive specialist runs."""
+from __future__ import annotations
+
+import json
+import time
+from typing import Any, Optional
+
+try:  # openai ships with crewai; keep the core install free of it
+    from openai import OpenAI
+except ImportError:  # pragma: no cover - depends on optional extra
+    OpenAI = None  # type: ignore[assignment]
+
+from .config import get_settings
+
+BATCH_ENDPOINT = "/v1/chat/completions"
+_TERMINAL_STATUSES = {"completed", "failed", "expired", "cancelled"}
+
+
+class BatchLLMError(Exception):
+    """Raised when a batch job cannot be submitted or completes unsuccessfully."""
+    pass
+
+
+def _client(client: Optional[Any] = None) -> Any:
+    """Return the injected client or build one from settings."""
+    if client is not None:
+        return client
+    if OpenAI is None:
+        raise BatchLLMError("The openai package is required for the Batch API path")
+    return OpenAI(api_key=get_settings().openai_api_key or None)
+
+
+def build_batch_file(prompts: list[dict[str, str]], model: str) -> bytes:
+    """
+    Render prompts as Batch API JSONL request lines.
+
+    Args:
+        prompts: Dicts with ``custom_id``, ``system`` and ``prompt`` keys
+        model: Chat completion model for every request
+
+    Returns:
+        JSONL payload ready for upload
+    """
+    lines = [
+        json.dumps(
+            {
+                "custom_id": item["custom_id"],
+                "method": "POST",
+                "url": BATCH_ENDPOINT,
+                "body": {
+                    "model": model,
+                    "temperature": 0,
+                    "messages": [
+                        {"role": "system", "content": item["system"]},
+                        {"role": "user", "content": item["prompt"]},
+                    ],
+                },
+            }
+        )
+        for item in prompts
+    ]
+    return ("\n".join(lines) + "\n").encode("utf-8")
+
+
+def submit_batch(
+    prompts: list[dict[str, str]],
+    *,
+    model: Optional[str] = None,
+    client: Optional[Any] = None,
+) -> str:
+    """Upload prompts and create a 24h batch job; returns the batch id."""
+    openai_client = _client(client)
+    payload = build_batch_file(prompts, model or get_settings().batch_api_model)
+    upload = openai_client.files.create(file=("specialists.jsonl", payload), purpose="batch")
+    batch = openai_client.batches.create(
+        input_file_id=upload.id,
+        endpoint=BATCH_ENDPOINT,
+        completion_window="24h",
+    )
+    return batch.id
+
+
+def parse_batch_output(text: str) -> dict[str, str]:
+    """Map ``custom_id`` to the assistant message content for each successful line."""
+    results: dict[str, str] = {}
+    for line in text.splitlines():
+        if not line.strip():
+            continue
+        record = json.loads(line)
+        response = record.get("response") or {}
+        if response.get("status_code") != 200:
+            continue
+        choices = (response.get("body") or {}).get("choices") or []
+        if choices:
+            results[record["custom_id"]] = choices[0]["message"]["content"] or ""
+    return results
+
+
+def collect_batch(
+    batch_id: str,
+    *,
+    client: Optional[Any] = None,
+    poll_interval: float = 30.0,
+    timeout: Optional[float] = None,
+) -> dict[str, str]:
+    """
+    Poll a batch until it finishes and return its outputs keyed by ``custom_id``.
+
+    Blocking; call through ``asyncio.to_thread`` from async code.
+    """
+    openai_client = _client(client)
+    deadline = None if timeout is None else time.monotonic() + timeout
+    while True:
+        batch = openai_client.batches.retrieve(batch_id)
+        if batch.status in _TERMINAL_STATUSES:
+            break
+        if deadline is not None and time.monotonic() >= deadline:
+            raise BatchLLMError(f"Batch {batch_id} still {batch.status} after {timeout}s")
+        time.sleep(poll_interval)
+
+    if batch.status != "completed" or not batch.output_file_id:
+        raise BatchLLMError(f"Batch {batch_id} finished with status {batch.status}")
+    return parse_batch_output(openai_client.files.content(batch.output_file_id).text)
+
+
+__all__ = [
+    "BatchLLMError",
+    "build_batch_file",
+    "submit_batch",
+    "parse_batch_output",
+    "collect_batch",
+]
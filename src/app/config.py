@@ -1,16 +1,35 @@
 """Configuration management using Pydantic settings."""
 import os
+import tempfile
+from functools import cached_property, lru_cache
 
 os.environ.setdefault("OTEL_SDK_DISABLED", "true")
 
+from dotenv import dotenv_values
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 try:  # pragma: no cover - defensive import to silence telemetry warnings
     from crewai.telemetry.telemetry import Telemetry  # type: ignore
+except ImportError:
+    Telemetry = None
 
+if Telemetry is not None and not getattr(Telemetry, "_tracer_disabled", False):
     Telemetry.set_tracer = lambda self: None  # noqa: E731
-except Exception:
-    pass
+    Telemetry._tracer_disabled = True
+
+
+@lru_cache(maxsize=1)
+def _dotenv() -> dict[str, str | None]:
+    """Parse .env once, only when a lazily-resolved key is first read."""
+    return dotenv_values(".env")
+
+
+def _optional_env(name: str) -> str:
+    """Resolve an optional key from the environment, then .env, defaulting to ''."""
+    value = os.environ.get(name)
+    if value is None:
+        value = _dotenv().get(name)
+    return value or ""
 
 
 class Settings(BaseSettings):
@@ -22,11 +41,6 @@ class Settings(BaseSettings):
     rapidapi_key: str = ""
     openai_api_key: str = ""
     
-    # Optional API keys for future extensions
-    news_api_key: str = ""
-    reddit_client_id: str = ""
-    reddit_client_secret: str = ""
-    
     # LoopNet API configuration
     loopnet_base_url: str = "https://loopnet-api.p.rapidapi.com"
     loopnet_host: str = "loopnet-api.p.rapidapi.com"
@@ -43,10 +57,43 @@ class Settings(BaseSettings):
     weight_vc_risk: float = 0.20
     weight_construction: float = 0.15
     
+    # OpenAI Batch API for bulk specialist runs (50% cheaper, up to 24h turnaround).
+    # Only the CLI reads use_batch_api (as the --batch-api default); the API never batches.
+    use_batch_api: bool = False
+    batch_api_model: str = "gpt-4o-mini"
+    batch_api_timeout: float = 24 * 3600
+    
+    # Exact-match cache for agent responses (identical prompt -> no LLM call)
+    llm_cache_enabled: bool = False
+    llm_cache_ttl: int = 7 * 24 * 3600
+    llm_cache_path: str = ".cache/llm_responses.sqlite3"
+    
+    # Serper news response cache (NEWS_CACHE_TTL=0 disables)
+    news_cache_ttl: int = 6 * 3600
+    # Under the temp dir so read-only deploys (e.g. Vercel's /var/task) can still write it
+    news_cache_path: str = os.path.join(tempfile.gettempdir(), "nivhenn", "serper_news.sqlite3")
+    
+    # On-disk LoopNet response cache for dev re-runs (HTTP_CACHE=1 to enable)
+    http_cache: bool = False
+    http_cache_dir: str = ".cache/http"
+    
     # Output configuration
     output_dir: str = "./out"
     frontend_origins: list[str] = []
     
+    # Optional API keys for future extensions, resolved on first access only
+    @cached_property
+    def news_api_key(self) -> str:
+        return _optional_env("NEWS_API_KEY")
+    
+    @cached_property
+    def reddit_client_id(self) -> str:
+        return _optional_env("REDDIT_CLIENT_ID")
+    
+    @cached_property
+    def reddit_client_secret(self) -> str:
+        return _optional_env("REDDIT_CLIENT_SECRET")
+    
     def get_weights(self) -> dict[str, float]:
         """Return agent weights as a dictionary."""
         return {
@@ -58,5 +105,11 @@ class Settings(BaseSettings):
         }
 
 
-# Global settings instance
-settings = Settings()
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Return the process-wide Settings, parsing .env and validating fields only once."""
+    return Settings()
+
+
+# Global settings instance (kept for existing `from .config import settings` imports)
+settings = get_settings()
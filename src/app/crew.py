@@ -1,15 +1,24 @@
 """CrewAI orchestration - coordinates all agents for property analysis."""
 import asyncio
-import json
+import copy
 import logging
+import re
+import threading
 from dataclasses import dataclass
-from typing import Any, Optional, Sequence
+from itertools import islice
+from operator import methodcaller
+from string import Formatter
+from types import SimpleNamespace
+from typing import Any, Callable, Optional, Sequence
 from crewai import Crew, Task
 
 from .models import Listing, AgentOutput, FinalReport, AgentScores
-from .config import settings
+from .config import get_settings
 from .scoring import weighted_overall, to_int_1_100
 from .serper_news import search_news
+from .batch_llm import collect_batch, submit_batch
+from .serialization import dumps as json_dumps, loads as json_loads
+from .llm_cache import CacheBackend, SqliteCache, cache_key
 from ..agents.investor import create_investor_agent, INVESTOR_TASK_TEMPLATE
 from ..agents.location_risk import create_location_agent, LOCATION_TASK_TEMPLATE
 from ..agents.news_reddit import create_news_agent, NEWS_TASK_TEMPLATE
@@ -32,6 +41,66 @@ ALL_AGENT_KEYS: tuple[str, ...] = (
 )
 
 
+def _compile_template(template: str):
+    """Pre-parse a str.format prompt template into literal/field chunks once.
+
+    The returned callable renders by joining the chunks, so the template text is
+    not re-lexed for every listing. ``{{``/``}}`` escapes are resolved at parse time.
+    """
+    chunks = [(literal, field) for literal, field, _, _ in Formatter().parse(template)]
+    field_positions = [i for i, (_, field) in enumerate(chunks) if field is not None]
+
+    if len(field_positions) == 1:
+        # Single placeholder: freeze the text around it into a prefix and a suffix
+        split = field_positions[0]
+        field = chunks[split][1]
+        prefix = "".join(literal for literal, _ in chunks[: split + 1])
+        suffix = "".join(literal for literal, _ in chunks[split + 1 :])
+
+        def render_single(**values: Any) -> str:
+            return f"{prefix}{values[field]}{suffix}"
+
+        return render_single
+
+    def render(**values: Any) -> str:
+        return "".join(
+            literal if field is None else f"{literal}{values[field]}"
+            for literal, field in chunks
+        )
+
+    return render
+
+
+# Serper results requested per listing and rendered into the news prompt
+NEWS_ITEM_LIMIT = 8
+
+
+def _render_news_item(item: dict) -> str:
+    """Render one normalized Serper item as a markdown bullet."""
+    return (
+        f"- [{item.get('date') or 'Unknown date'}] "
+        f"{item.get('source') or 'Unknown source'}: {item.get('title') or 'Untitled'}\n"
+        f"  Summary: {item.get('snippet') or ''}\n"
+        f"  Link: {item.get('link') or ''}"
+    )
+
+
+def _rationale_section(name: str, output: AgentOutput) -> str:
+    """One aggregator-prompt section: rationale plus up to three notes."""
+    return f"**{name}:** {output.rationale}\nNotes: {', '.join(islice(output.notes, 3))}"
+
+
+# JSON object inside a ``` or ```json fence, tolerating prose before/after the block
+_FENCED_JSON_RE = re.compile(r"```(?:json)?\s*(\{.*?\})\s*```", re.DOTALL)
+
+_INVESTOR_PROMPT = _compile_template(INVESTOR_TASK_TEMPLATE)
+_LOCATION_PROMPT = _compile_template(LOCATION_TASK_TEMPLATE)
+_NEWS_PROMPT = _compile_template(NEWS_TASK_TEMPLATE)
+_VC_RISK_PROMPT = _compile_template(VC_RISK_TASK_TEMPLATE)
+_CONSTRUCTION_PROMPT = _compile_template(CONSTRUCTION_TASK_TEMPLATE)
+_AGGREGATOR_PROMPT = _compile_template(AGGREGATOR_TASK_TEMPLATE)
+
+
 @dataclass
 class SpecialistResult:
     """Intermediate results from specialist agents."""
@@ -52,23 +121,52 @@ class PropertyAnalysisCrew:
     """Orchestrates multi-agent analysis of property listings."""
     
     def __init__(self):
-        """Initialize all agents once for reuse."""
+        """Initialize this crew's agents and the shared scoring/cache settings."""
+        self._create_agents()
+        # One slot shared by every with_fresh_agents() copy, so the LA agent and its
+        # Socrata session are built once per crew rather than once per listing
+        self._la_slot = SimpleNamespace(agent=None, lock=threading.Lock())
+        
+        settings = get_settings()
+        self.weights = settings.get_weights()
+        self.llm_cache: Optional[CacheBackend] = (
+            SqliteCache(settings.llm_cache_path, ttl=settings.llm_cache_ttl)
+            if settings.llm_cache_enabled
+            else None
+        )
+
+    def _create_agents(self) -> None:
+        """Build this crew's specialist and aggregator agents.
+
+        CrewAI writes per-run state (crew, executor, message history) onto an Agent,
+        so agents must never be shared by analyses that run at the same time.
+        """
         self.investor_agent = create_investor_agent()
         self.location_agent = create_location_agent()
         self.news_agent = create_news_agent()
         self.vc_risk_agent = create_vc_risk_agent()
         self.construction_agent = create_construction_agent()
         self.aggregator_agent = create_aggregator_agent()
-        self._la_property_agent: Optional[LAPropertyIngestorAgent] = None
-        
-        self.weights = settings.get_weights()
+
+    def with_fresh_agents(self) -> "PropertyAnalysisCrew":
+        """
+        Copy this crew with its own agents for one concurrent analysis.
+
+        The LLM cache, scoring weights and LA property agent hold no CrewAI run
+        state and stay shared.
+        """
+        clone = copy.copy(self)
+        clone._create_agents()
+        return clone
 
     @property
     def la_property_agent(self) -> LAPropertyIngestorAgent:
         """Lazy-create the LA property ingestion agent on demand."""
-        if self._la_property_agent is None:
-            self._la_property_agent = create_la_property_agent()
-        return self._la_property_agent
+        slot = self._la_slot
+        with slot.lock:
+            if slot.agent is None:
+                slot.agent = create_la_property_agent()
+        return slot.agent
 
     def fetch_la_city_records(self, listing: Listing, *, limit: int = 50) -> dict[str, Any]:
         """Public helper for retrieving LA records for a listing."""
@@ -92,24 +190,14 @@ class PropertyAnalysisCrew:
         )
         cap_rate = f"{listing.cap_rate}%" if listing.cap_rate else "N/A"
         return (
-            "Address: {address}\n"
-            "City: {city}, State: {state}\n"
-            "Asking Price: {ask_price}\n"
-            "Building Size: {building_size}\n"
-            "Property Type: {property_type}\n"
-            "Cap Rate: {cap_rate}\n"
-            "Year Built: {year_built}\n"
-            "Units: {units}\n"
-        ).format(
-            address=listing.address or "N/A",
-            city=listing.city or "N/A",
-            state=listing.state or "N/A",
-            ask_price=ask_price,
-            building_size=building_size,
-            property_type=listing.property_type or "N/A",
-            cap_rate=cap_rate,
-            year_built=listing.year_built or "N/A",
-            units=listing.units or "N/A",
+            f"Address: {listing.address or 'N/A'}\n"
+            f"City: {listing.city or 'N/A'}, State: {listing.state or 'N/A'}\n"
+            f"Asking Price: {ask_price}\n"
+            f"Building Size: {building_size}\n"
+            f"Property Type: {listing.property_type or 'N/A'}\n"
+            f"Cap Rate: {cap_rate}\n"
+            f"Year Built: {listing.year_built or 'N/A'}\n"
+            f"Units: {listing.units or 'N/A'}\n"
         )
 
     def _build_news_query(self, listing: Listing) -> str:
@@ -134,16 +222,7 @@ class PropertyAnalysisCrew:
                 return f"{base}\nNote: {note}"
             return base
 
-        lines = ["Recent Serper news results:"]
-        for item in items[:8]:
-            title = item.get("title") or "Untitled"
-            source = item.get("source") or "Unknown source"
-            date = item.get("date") or "Unknown date"
-            snippet = item.get("snippet") or ""
-            link = item.get("link") or ""
-            lines.append(
-                f"- [{date}] {source}: {title}\n  Summary: {snippet}\n  Link: {link}"
-            )
+        lines = ["Recent Serper news results:", *map(_render_news_item, items[:NEWS_ITEM_LIMIT])]
         if note:
             lines.append(f"Note: {note}")
         return "\n".join(lines)
@@ -154,37 +233,108 @@ class PropertyAnalysisCrew:
         
         Handles various formats and extraction issues.
         """
+        if not raw_output or raw_output.isspace():
+            # Nothing to parse; skip the JSON machinery entirely
+            return AgentOutput.model_construct(
+                score_1_to_100=50,
+                rationale="Agent returned no output; defaulting to neutral score.",
+                notes=["Check agent configuration or API responses."],
+            )
         try:
             # Try to extract JSON from markdown code blocks
-            if "```json" in raw_output:
-                start = raw_output.find("```json") + 7
-                end = raw_output.find("```", start)
-                json_str = raw_output[start:end].strip()
-            elif "```" in raw_output:
-                start = raw_output.find("```") + 3
-                end = raw_output.find("```", start)
-                json_str = raw_output[start:end].strip()
-            else:
-                json_str = raw_output.strip()
+            fenced = _FENCED_JSON_RE.search(raw_output)
+            json_str = fenced.group(1) if fenced else raw_output.strip()
             
             # Parse JSON
-            data = json.loads(json_str)
+            data = json_loads(json_str)
             
-            # Validate and create AgentOutput
-            return AgentOutput(
-                score_1_to_100=to_int_1_100(data.get("score_1_to_100", 50)),
-                rationale=data.get("rationale", "No rationale provided"),
-                notes=data.get("notes", [])
-            )
+            score = to_int_1_100(data.get("score_1_to_100", 50))
+            rationale = data.get("rationale", "No rationale provided")
+            notes = data.get("notes", []) or []
+            if isinstance(rationale, str) and isinstance(notes, list) and all(
+                isinstance(note, str) for note in notes
+            ):
+                # Types already match the schema and the score is clamped; skip validation
+                return AgentOutput.model_construct(
+                    score_1_to_100=score, rationale=rationale, notes=notes
+                )
+            # Unexpected shapes still go through full validation
+            return AgentOutput(score_1_to_100=score, rationale=rationale, notes=notes)
         except Exception as e:
             # Fallback to neutral score if parsing fails
-            print(f"Warning: Failed to parse agent output: {e}")
+            logger.warning("Failed to parse agent output: %s", e)
             return AgentOutput(
                 score_1_to_100=50,
                 rationale=f"Parse error: {str(e)}",
                 notes=["Failed to parse agent response"]
             )
 
+    @staticmethod
+    def _specialist_crew(agent, description: str) -> Crew:
+        """Wrap a single specialist task in its own crew."""
+        task = Task(
+            description=description,
+            agent=agent,
+            expected_output="JSON with score_1_to_100, rationale, and notes",
+        )
+        return Crew(agents=[agent], tasks=[task], verbose=False)
+
+    @staticmethod
+    def _llm_cache_key(crew: Crew) -> str:
+        """Cache key for a single-agent crew: agent role, model and rendered prompt."""
+        agent = crew.agents[0]
+        model = getattr(getattr(agent, "llm", None), "model", None) or ""
+        return cache_key(getattr(agent, "role", ""), str(model), crew.tasks[-1].description)
+
+    async def _kickoff(self, crew: Crew):
+        """Run a crew without blocking the event loop.
+
+        Uses CrewAI's native ``kickoff_async`` when the installed version has it and
+        falls back to running the synchronous ``kickoff`` in a worker thread. When the
+        LLM cache is enabled, an identical prompt for the same agent is answered from it.
+        """
+        key = self._llm_cache_key(crew) if self.llm_cache is not None else None
+        if key is not None:
+            cached = await asyncio.to_thread(self.llm_cache.get, key)
+            if cached is not None:
+                return SimpleNamespace(tasks_output=[SimpleNamespace(raw=cached)])
+
+        kickoff_async = getattr(crew, "kickoff_async", None)
+        if kickoff_async is not None:
+            result = await kickoff_async()
+        else:
+            result = await asyncio.to_thread(crew.kickoff)
+
+        if key is not None and result.tasks_output:
+            raw_str = self._extract_raw_output(result.tasks_output[-1])
+            if raw_str:
+                await asyncio.to_thread(self.llm_cache.set, key, raw_str)
+        return result
+
+    async def _run_news_specialist(
+        self,
+        news_fetch: "asyncio.Task[dict]",
+        location_details: str,
+    ) -> tuple[str, bool, Any]:
+        """Await the Serper prefetch, then run the news crew on its context.
+
+        Returns ``(news_context, serper_missing, crew_output)``; a crew failure is
+        returned as the exception so it is handled like the other specialists.
+        """
+        news_response = await news_fetch
+        news_context = self._format_news_context(news_response)
+        if news_response.get("note") == "SERPER_API_KEY missing":
+            return news_context, True, None
+
+        news_crew = self._specialist_crew(
+            self.news_agent,
+            _NEWS_PROMPT(area_info=location_details, news_data=news_context),
+        )
+        try:
+            return news_context, False, await self._kickoff(news_crew)
+        except Exception as exc:
+            return news_context, False, exc
+
     @staticmethod
     def _extract_raw_output(task_output) -> str:
         """Extract a raw string representation from a CrewAI TaskOutput."""
@@ -192,149 +342,108 @@ class PropertyAnalysisCrew:
             return task_output.raw
         if getattr(task_output, "json_dict", None):
             try:
-                return json.dumps(task_output.json_dict)
+                return json_dumps(task_output.json_dict)
             except Exception:
                 return str(task_output.json_dict)
-        return str(task_output)
+        return ""
     
-    async def run_specialists(
+    @staticmethod
+    def _location_details(listing: Listing) -> str:
+        """City/state string used by the location and news prompts."""
+        if listing.city and listing.state:
+            return f"{listing.city}, {listing.state}"
+        return listing.city or "Unknown location"
+
+    async def _la_records_for(
         self,
         listing: Listing,
-        enabled_agents: Optional[Sequence[str]] = None,
-    ) -> SpecialistResult:
-        """Run specialist agents and return their parsed outputs."""
-
-        enabled_set = set(enabled_agents) if enabled_agents else set(ALL_AGENT_KEYS)
-
-        listing_details = self._format_listing_details(listing)
-        location_details = (
-            f"{listing.city}, {listing.state}"
-            if listing.city and listing.state
-            else listing.city
-            if listing.city
-            else "Unknown location"
-        )
-
+        enabled_agents: Optional[Sequence[str]],
+        enabled_set: set[str],
+    ) -> Optional[dict[str, Any]]:
+        """Fetch LA city records when the LA agent applies to this listing."""
         include_la_city = listing.address and (
             enabled_agents is None or "la_city" in enabled_set
         )
+        if not (include_la_city and listing.address):
+            return None
+        try:
+            # Socrata lookups are blocking HTTP; keep them off the event loop
+            return await asyncio.to_thread(self.fetch_la_city_records, listing)
+        except (LASocrataError, ValueError) as exc:
+            logger.warning(
+                "LA city records unavailable for %s (%s)",
+                listing.address,
+                exc,
+            )
+        except Exception as exc:  # pragma: no cover - defensive
+            logger.exception("Unexpected LA property ingestion failure: %s", exc)
+        return None
 
-        la_city_records: Optional[dict[str, Any]] = None
-        if include_la_city and listing.address:
-            try:
-                la_city_records = self.fetch_la_city_records(listing)
-            except (LASocrataError, ValueError) as exc:
-                logger.warning(
-                    "LA city records unavailable for %s (%s)",
-                    listing.address,
-                    exc,
-                )
-            except Exception as exc:  # pragma: no cover - defensive
-                logger.exception("Unexpected LA property ingestion failure: %s", exc)
-
-        outputs: dict[str, AgentOutput] = {}
+    @staticmethod
+    def _seed_raw_outputs(la_city_records: Optional[dict[str, Any]]) -> dict[str, str]:
+        """Start the raw output map, embedding LA records when present."""
         raw_outputs: dict[str, str] = {}
-
         if la_city_records is not None:
             try:
-                raw_outputs["la_city_records"] = json.dumps(la_city_records)
+                raw_outputs["la_city_records"] = json_dumps(la_city_records)
             except TypeError:
                 raw_outputs["la_city_records"] = str(la_city_records)
+        return raw_outputs
 
-        # Prepare Serper context only when news agent is enabled
-        news_context = ""
-        serper_missing = False
-        news_response: dict | None = None
-
-        if "news" in enabled_set:
-            news_query = self._build_news_query(listing)
-            news_response = await asyncio.to_thread(search_news, news_query, 8)
-            news_context = self._format_news_context(news_response)
-            serper_missing = news_response.get("note") == "SERPER_API_KEY missing"
-
-            if serper_missing:
-                outputs["news"] = AgentOutput(
-                    score_1_to_100=50,
-                    rationale="Serper API key missing; defaulting to neutral score.",
-                    notes=[
-                        "Set SERPER_API_KEY to enable news sentiment analysis.",
-                        "Without news signals, rely on other agents for sentiment.",
-                    ],
-                )
-                raw_outputs["news"] = "Serper API key missing"
-
-        # Build tasks for enabled specialist agents
-        tasks: list[Task] = []
-        task_labels: list[str] = []
-        crew_agents = []
-
+    def _core_specialist_prompts(
+        self,
+        enabled_set: set[str],
+        listing_details: str,
+        location_details: str,
+    ) -> list[tuple[str, Any, str]]:
+        """Render (label, agent, prompt) for every enabled specialist except news."""
+        prompts: list[tuple[str, Any, str]] = []
         if "investment" in enabled_set:
-            investor_task = Task(
-                description=INVESTOR_TASK_TEMPLATE.format(listing_details=listing_details),
-                agent=self.investor_agent,
-                expected_output="JSON with score_1_to_100, rationale, and notes",
-            )
-            tasks.append(investor_task)
-            task_labels.append("investment")
-            crew_agents.append(self.investor_agent)
-
+            prompts.append((
+                "investment",
+                self.investor_agent,
+                _INVESTOR_PROMPT(listing_details=listing_details),
+            ))
         if "location" in enabled_set:
-            location_task = Task(
-                description=LOCATION_TASK_TEMPLATE.format(location_details=location_details),
-                agent=self.location_agent,
-                expected_output="JSON with score_1_to_100, rationale, and notes",
-            )
-            tasks.append(location_task)
-            task_labels.append("location")
-            crew_agents.append(self.location_agent)
-
-        if "news" in enabled_set and not serper_missing:
-            news_task = Task(
-                description=NEWS_TASK_TEMPLATE.format(
-                    area_info=location_details,
-                    news_data=news_context,
-                ),
-                agent=self.news_agent,
-                expected_output="JSON with score_1_to_100, rationale, and notes",
-            )
-            tasks.append(news_task)
-            task_labels.append("news")
-            crew_agents.append(self.news_agent)
-
+            prompts.append((
+                "location",
+                self.location_agent,
+                _LOCATION_PROMPT(location_details=location_details),
+            ))
         if "vc_risk" in enabled_set:
-            vc_risk_task = Task(
-                description=VC_RISK_TASK_TEMPLATE.format(property_details=listing_details),
-                agent=self.vc_risk_agent,
-                expected_output="JSON with score_1_to_100, rationale, and notes",
-            )
-            tasks.append(vc_risk_task)
-            task_labels.append("vc_risk")
-            crew_agents.append(self.vc_risk_agent)
-
+            prompts.append((
+                "vc_risk",
+                self.vc_risk_agent,
+                _VC_RISK_PROMPT(property_details=listing_details),
+            ))
         if "construction" in enabled_set:
-            construction_task = Task(
-                description=CONSTRUCTION_TASK_TEMPLATE.format(property_info=listing_details),
-                agent=self.construction_agent,
-                expected_output="JSON with score_1_to_100, rationale, and notes",
-            )
-            tasks.append(construction_task)
-            task_labels.append("construction")
-            crew_agents.append(self.construction_agent)
-
-        if tasks:
-            specialist_crew = Crew(
-                agents=crew_agents,
-                tasks=tasks,
-                verbose=False,
-            )
-            crew_output = await asyncio.to_thread(specialist_crew.kickoff)
+            prompts.append((
+                "construction",
+                self.construction_agent,
+                _CONSTRUCTION_PROMPT(property_info=listing_details),
+            ))
+        return prompts
 
-            for label, task_output in zip(task_labels, crew_output.tasks_output):
-                raw_str = self._extract_raw_output(task_output)
-                raw_outputs[label] = raw_str
-                outputs[label] = self._parse_agent_output(raw_str)
+    @staticmethod
+    def _serper_missing_output() -> AgentOutput:
+        """Neutral news output used when no Serper key is configured."""
+        return AgentOutput(
+            score_1_to_100=50,
+            rationale="Serper API key missing; defaulting to neutral score.",
+            notes=[
+                "Set SERPER_API_KEY to enable news sentiment analysis.",
+                "Without news signals, rely on other agents for sentiment.",
+            ],
+        )
 
-        # Fill in defaults for any agents that were not executed
+    @staticmethod
+    def _fill_default_outputs(
+        outputs: dict[str, AgentOutput],
+        raw_outputs: dict[str, str],
+        enabled_set: set[str],
+        serper_missing: bool,
+    ) -> None:
+        """Fill in neutral outputs for any agents that were not executed."""
         skipped_agents = set(ALL_AGENT_KEYS) - set(outputs.keys())
         for agent_key in skipped_agents:
             if agent_key not in enabled_set:
@@ -355,6 +464,75 @@ class PropertyAnalysisCrew:
                 )
                 raw_outputs[agent_key] = "Agent output missing"
 
+    async def run_specialists(
+        self,
+        listing: Listing,
+        enabled_agents: Optional[Sequence[str]] = None,
+    ) -> SpecialistResult:
+        """Run specialist agents and return their parsed outputs."""
+
+        enabled_set = set(enabled_agents) if enabled_agents else set(ALL_AGENT_KEYS)
+
+        listing_details = self._format_listing_details(listing)
+        location_details = self._location_details(listing)
+
+        la_city_records = await self._la_records_for(listing, enabled_agents, enabled_set)
+
+        outputs: dict[str, AgentOutput] = {}
+        raw_outputs = self._seed_raw_outputs(la_city_records)
+
+        # Start the Serper prefetch now so its HTTP latency overlaps the other specialists
+        news_fetch: Optional[asyncio.Task] = None
+        if "news" in enabled_set:
+            news_query = self._build_news_query(listing)
+            news_fetch = asyncio.create_task(
+                asyncio.to_thread(search_news, news_query, NEWS_ITEM_LIMIT)
+            )
+
+        news_context = ""
+        serper_missing = False
+
+        # One single-agent crew per enabled specialist so they can run concurrently
+        specialist_crews = [
+            (label, self._specialist_crew(agent, prompt))
+            for label, agent, prompt in self._core_specialist_prompts(
+                enabled_set, listing_details, location_details
+            )
+        ]
+
+        # Specialists are independent LLM round-trips: wall time is max(Ti), not sum(Ti)
+        labels = [label for label, _ in specialist_crews]
+        specialist_runs = asyncio.gather(
+            *(self._kickoff(crew) for _, crew in specialist_crews),
+            return_exceptions=True,
+        )
+
+        if news_fetch is not None:
+            crew_results, (news_context, serper_missing, news_output) = await asyncio.gather(
+                specialist_runs,
+                self._run_news_specialist(news_fetch, location_details),
+            )
+            if serper_missing:
+                outputs["news"] = self._serper_missing_output()
+                raw_outputs["news"] = "Serper API key missing"
+            else:
+                labels.append("news")
+                crew_results.append(news_output)
+        else:
+            crew_results = await specialist_runs
+
+        for label, crew_output in zip(labels, crew_results):
+            if isinstance(crew_output, Exception):
+                logger.warning("%s agent failed: %s", label, crew_output)
+                continue
+            if not crew_output.tasks_output:
+                continue
+            raw_str = self._extract_raw_output(crew_output.tasks_output[-1])
+            raw_outputs[label] = raw_str
+            outputs[label] = self._parse_agent_output(raw_str)
+
+        self._fill_default_outputs(outputs, raw_outputs, enabled_set, serper_missing)
+
         return SpecialistResult(
             outputs=outputs,
             raw_outputs=raw_outputs,
@@ -365,6 +543,100 @@ class PropertyAnalysisCrew:
             la_city_records=la_city_records,
         )
 
+    @staticmethod
+    def _system_prompt(agent) -> str:
+        """Flatten a CrewAI agent persona into a chat system message."""
+        role = getattr(agent, "role", "")
+        goal = getattr(agent, "goal", "")
+        backstory = getattr(agent, "backstory", "")
+        return f"You are {role}. {backstory}\nYour personal goal is: {goal}"
+
+    async def run_specialists_batch(
+        self,
+        listings: Sequence[Listing],
+        enabled_agents: Optional[Sequence[str]] = None,
+    ) -> list[SpecialistResult]:
+        """
+        Run every listing's specialist prompts as a single OpenAI Batch API job.
+
+        Trades latency (up to the 24h batch window) for half-price tokens on bulk
+        runs. Context gathering (LA records, Serper news) still happens live.
+        """
+        enabled_set = set(enabled_agents) if enabled_agents else set(ALL_AGENT_KEYS)
+
+        async def _prepare(listing: Listing):
+            listing_details = self._format_listing_details(listing)
+            location_details = self._location_details(listing)
+            la_city_records = await self._la_records_for(listing, enabled_agents, enabled_set)
+            prompts = self._core_specialist_prompts(enabled_set, listing_details, location_details)
+
+            news_context = ""
+            serper_missing = False
+            if "news" in enabled_set:
+                news_query = self._build_news_query(listing)
+                news_response = await asyncio.to_thread(search_news, news_query, NEWS_ITEM_LIMIT)
+                news_context = self._format_news_context(news_response)
+                serper_missing = news_response.get("note") == "SERPER_API_KEY missing"
+                if not serper_missing:
+                    prompts.append((
+                        "news",
+                        self.news_agent,
+                        _NEWS_PROMPT(area_info=location_details, news_data=news_context),
+                    ))
+            return listing_details, location_details, la_city_records, news_context, serper_missing, prompts
+
+        prepared = await asyncio.gather(*(_prepare(listing) for listing in listings))
+
+        requests = [
+            {
+                "custom_id": f"{index}:{label}",
+                "system": self._system_prompt(agent),
+                "prompt": prompt,
+            }
+            for index, (*_context, prompts) in enumerate(prepared)
+            for label, agent, prompt in prompts
+        ]
+        completions: dict[str, str] = {}
+        if requests:
+            batch_id = await asyncio.to_thread(submit_batch, requests)
+            logger.info("Submitted specialist batch %s (%d prompts)", batch_id, len(requests))
+            completions = await asyncio.to_thread(
+                collect_batch, batch_id, timeout=get_settings().batch_api_timeout
+            )
+
+        results: list[SpecialistResult] = []
+        for index, (
+            listing_details,
+            location_details,
+            la_city_records,
+            news_context,
+            serper_missing,
+            prompts,
+        ) in enumerate(prepared):
+            outputs: dict[str, AgentOutput] = {}
+            raw_outputs = self._seed_raw_outputs(la_city_records)
+            if serper_missing:
+                outputs["news"] = self._serper_missing_output()
+                raw_outputs["news"] = "Serper API key missing"
+            for label, _agent, _prompt in prompts:
+                raw_str = completions.get(f"{index}:{label}")
+                if raw_str is None:
+                    logger.warning("%s agent missing from batch output (listing #%d)", label, index)
+                    continue
+                raw_outputs[label] = raw_str
+                outputs[label] = self._parse_agent_output(raw_str)
+            self._fill_default_outputs(outputs, raw_outputs, enabled_set, serper_missing)
+            results.append(SpecialistResult(
+                outputs=outputs,
+                raw_outputs=raw_outputs,
+                listing_details=listing_details,
+                location_details=location_details,
+                news_context=news_context,
+                serper_missing=serper_missing,
+                la_city_records=la_city_records,
+            ))
+        return results
+
     async def analyze_listing(
         self,
         listing: Listing,
@@ -373,6 +645,76 @@ class PropertyAnalysisCrew:
         specialist_result = await self.run_specialists(listing, enabled_agents)
         return await self.build_final_report(listing, specialist_result)
 
+    async def analyze_listings_batch(
+        self,
+        listings: Sequence[Listing],
+        enabled_agents: Optional[Sequence[str]] = None,
+        *,
+        max_concurrency: int = 10,
+        on_progress: Optional[Callable[[Listing, FinalReport | BaseException], None]] = None,
+        return_exceptions: bool = False,
+        use_batch_api: bool = False,
+    ) -> list[FinalReport | BaseException]:
+        """
+        Analyze many listings concurrently, at most ``max_concurrency`` at a time.
+
+        Args:
+            listings: Listings to analyze
+            enabled_agents: Specialist keys to run for every listing (None = all)
+            max_concurrency: Upper bound on listings in flight (LLM/API rate limits)
+            on_progress: Optional callback invoked with (listing, result) as each finishes
+            return_exceptions: Return failures in place instead of raising the first one
+            use_batch_api: Run specialists through one OpenAI Batch API job (slow; offline use only)
+
+        Returns:
+            Reports (or exceptions) in the same order as ``listings``
+        """
+        if use_batch_api:
+            # Specialists go through one Batch API job; the aggregator still runs live
+            specialist_results = await self.run_specialists_batch(listings, enabled_agents)
+            jobs = [
+                methodcaller("build_final_report", listing, result)
+                for listing, result in zip(listings, specialist_results)
+            ]
+        else:
+            jobs = [methodcaller("analyze_listing", listing, enabled_agents) for listing in listings]
+
+        semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+        async def _one(listing: Listing, job) -> FinalReport:
+            async with semaphore:
+                try:
+                    # Agents carry per-run state, so each in-flight listing gets its own
+                    report = await job(self.with_fresh_agents())
+                except Exception as exc:
+                    if on_progress is not None:
+                        on_progress(listing, exc)
+                    raise
+            if on_progress is not None:
+                on_progress(listing, report)
+            return report
+
+        return list(
+            await asyncio.gather(
+                *(_one(listing, job) for listing, job in zip(listings, jobs)),
+                return_exceptions=return_exceptions,
+            )
+        )
+
+    @staticmethod
+    def _score_row(outputs: dict[str, AgentOutput]) -> dict[str, int]:
+        """Map weight keys to specialist scores for weighted scoring."""
+        return {key: outputs[key].score_1_to_100 for key in ALL_AGENT_KEYS}
+
+    def _effective_weights(self, specialist_result: SpecialistResult) -> dict[str, float]:
+        """Drop the news weight when Serper never ran so the overall reflects real signals.
+
+        ``weighted_overall`` divides by the total weight, so the rest renormalize.
+        """
+        if specialist_result.serper_missing:
+            return {key: weight for key, weight in self.weights.items() if key != "news"}
+        return self.weights
+
     async def build_final_report(
         self,
         listing: Listing,
@@ -383,6 +725,7 @@ class PropertyAnalysisCrew:
         
         Args:
             listing: Property listing to analyze
+            specialist_result: Parsed specialist outputs for the listing
         
         Returns:
             FinalReport with scores and memo
@@ -395,14 +738,9 @@ class PropertyAnalysisCrew:
         vc_risk_output = outputs["vc_risk"]
         construction_output = outputs["construction"]
 
-        scores_dict = {
-            "investment": investment_output.score_1_to_100,
-            "location": location_output.score_1_to_100,
-            "news": news_output.score_1_to_100,
-            "vc_risk": vc_risk_output.score_1_to_100,
-            "construction": construction_output.score_1_to_100,
-        }
-        overall_score = weighted_overall(scores_dict, self.weights)
+        overall_score = weighted_overall(
+            self._score_row(outputs), self._effective_weights(specialist_result)
+        )
         
         # Prepare aggregator input
         specialist_scores = f"""
@@ -414,26 +752,17 @@ Construction: {construction_output.score_1_to_100}/100
 Weighted Overall: {overall_score}/100
 """
         
-        specialist_rationales = f"""
-**Investment:** {investment_output.rationale}
-Notes: {', '.join(investment_output.notes[:3])}
-
-**Location:** {location_output.rationale}
-Notes: {', '.join(location_output.notes[:3])}
-
-**News:** {news_output.rationale}
-Notes: {', '.join(news_output.notes[:3])}
-
-**VC Risk:** {vc_risk_output.rationale}
-Notes: {', '.join(vc_risk_output.notes[:3])}
-
-**Construction:** {construction_output.rationale}
-Notes: {', '.join(construction_output.notes[:3])}
-"""
+        specialist_rationales = "\n{}\n".format("\n\n".join([
+            _rationale_section("Investment", investment_output),
+            _rationale_section("Location", location_output),
+            _rationale_section("News", news_output),
+            _rationale_section("VC Risk", vc_risk_output),
+            _rationale_section("Construction", construction_output),
+        ]))
         
         # Run aggregator
         aggregator_task = Task(
-            description=AGGREGATOR_TASK_TEMPLATE.format(
+            description=_AGGREGATOR_PROMPT(
                 property_summary=specialist_result.listing_details,
                 specialist_scores=specialist_scores,
                 specialist_rationales=specialist_rationales
@@ -447,7 +776,7 @@ Notes: {', '.join(construction_output.notes[:3])}
             tasks=[aggregator_task],
             verbose=False,
         )
-        aggregator_result = await asyncio.to_thread(aggregator_crew.kickoff)
+        aggregator_result = await self._kickoff(aggregator_crew)
         if aggregator_result.tasks_output:
             aggregator_raw = self._extract_raw_output(aggregator_result.tasks_output[-1])
         else:
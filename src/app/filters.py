@@ -3,15 +3,18 @@ from __future__ import annotations
 
 import json
 from pathlib import Path
-from threading import Lock
-from typing import Any, Dict
+from threading import RLock
+from typing import Any, Dict, Optional
 
 from pydantic import ValidationError
 
 from .models import SearchParams
 
 _FILTERS_FILE = Path(__file__).resolve().parents[2] / "config" / "filters.json"
-_LOCK = Lock()
+# Re-entrant: load_filters rewrites defaults while already holding the lock
+_LOCK = RLock()
+# ((path, mtime_ns, size), parsed JSON) of the last read; any write or edit changes the key
+_RAW_CACHE: Optional[tuple[tuple[str, int, int], Dict[str, Any]]] = None
 _DEFAULT_FILTERS = SearchParams(
     locationId="Los Angeles, CA",
     locationType="city",
@@ -25,10 +28,24 @@ def _ensure_storage() -> None:
     _FILTERS_FILE.parent.mkdir(parents=True, exist_ok=True)
 
 
+def _read_raw() -> Dict[str, Any]:
+    """Parse filters.json, reusing the previous parse while the file is unchanged."""
+    global _RAW_CACHE
+    stat = _FILTERS_FILE.stat()
+    key = (str(_FILTERS_FILE), stat.st_mtime_ns, stat.st_size)
+    if _RAW_CACHE is not None and _RAW_CACHE[0] == key:
+        return _RAW_CACHE[1]
+    raw = json.loads(_FILTERS_FILE.read_text(encoding="utf-8") or "{}")
+    _RAW_CACHE = (key, raw)
+    return raw
+
+
 def _write_filters(params: SearchParams) -> None:
     """Write filters to disk in a thread-safe manner."""
+    global _RAW_CACHE
     _ensure_storage()
     with _LOCK:
+        _RAW_CACHE = None
         _FILTERS_FILE.write_text(
             json.dumps(params.model_dump(exclude_none=True), indent=2, sort_keys=True),
             encoding="utf-8",
@@ -43,8 +60,7 @@ def load_filters() -> SearchParams:
             _write_filters(_DEFAULT_FILTERS)
             return _DEFAULT_FILTERS.model_copy(deep=True)
         try:
-            raw = json.loads(_FILTERS_FILE.read_text(encoding="utf-8") or "{}")
-            params = SearchParams(**raw)
+            params = SearchParams(**_read_raw())
         except (json.JSONDecodeError, ValidationError):
             _write_filters(_DEFAULT_FILTERS)
             params = _DEFAULT_FILTERS.model_copy(deep=True)
@@ -58,12 +74,20 @@ def load_city_name() -> str | None:
         if not _FILTERS_FILE.exists():
             return None
         try:
-            raw = json.loads(_FILTERS_FILE.read_text(encoding="utf-8") or "{}")
-            return raw.get("cityName")
+            return _read_raw().get("cityName")
         except (json.JSONDecodeError, KeyError):
             return None
 
 
+def filters_etag() -> str | None:
+    """Weak ETag for the stored filters, derived from filters.json's mtime and size."""
+    try:
+        stat = _FILTERS_FILE.stat()
+    except FileNotFoundError:
+        return None
+    return f'W/"{stat.st_mtime_ns:x}-{stat.st_size:x}"'
+
+
 def save_filters(params: SearchParams) -> SearchParams:
     """Persist validated filters and return the stored value."""
     _write_filters(params)
@@ -96,5 +120,6 @@ __all__ = [
     "update_filters",
     "reset_filters",
     "load_city_name",
+    "filters_etag",
     "_FILTERS_FILE",
 ]
@@ -1,59 +1,73 @@
 """Generate beautiful HTML reports from analysis data."""
+import functools
+import re
+from html import escape
 from pathlib import Path
-from typing import Optional
+from typing import Iterator, Optional
 from datetime import datetime
 
+try:  # markdown-it-py ships with rich; fall back to the regex converter without it
+    from markdown_it import MarkdownIt
+except ImportError:  # pragma: no cover - depends on optional extra
+    MarkdownIt = None
 
-def generate_html_report(report, listing, output_path: Path) -> None:
-    """Generate an HTML report for a property analysis."""
-    
-    html = f"""<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Property Analysis: {report.address}</title>
-    <style>
-        * {{
+
+_WRITE_BUFFER_SIZE = 64 * 1024
+
+# Badge colour per score; AgentScores validates scores to 1-100, so index directly
+_SCORE_CLASSES = tuple("low" if s < 40 else "medium" if s < 70 else "" for s in range(101))
+
+# URL slug: spaces -> dashes, commas dropped, in one C-level pass
+_SLUG_TABLE = str.maketrans({" ": "-", ",": None})
+
+# Markdown patterns used by markdown_to_html
+_BOLD_RE = re.compile(r"\*\*(.*?)\*\*")
+_HEADER_RE = re.compile(r"^(#{2,3}) (.*)$", re.MULTILINE)
+_BULLETS_RE = re.compile(r"(?:^[ \t]*- .*(?:\n|$))+", re.MULTILINE)
+_MARKDOWN = MarkdownIt("commonmark", {"html": False}) if MarkdownIt is not None else None
+
+# Static stylesheet; a plain literal so it is never re-scanned for format fields
+_CSS = """\
+        * {
             margin: 0;
             padding: 0;
             box-sizing: border-box;
-        }}
+        }
         
-        body {{
+        body {
             font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, Oxygen, Ubuntu, Cantarell, sans-serif;
             line-height: 1.6;
             color: #333;
             background: #f5f5f5;
             padding: 20px;
-        }}
+        }
         
-        .container {{
+        .container {
             max-width: 1200px;
             margin: 0 auto;
             background: white;
             border-radius: 12px;
             box-shadow: 0 2px 8px rgba(0,0,0,0.1);
             overflow: hidden;
-        }}
+        }
         
-        .header {{
+        .header {
             background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
             color: white;
             padding: 40px;
-        }}
+        }
         
-        .header h1 {{
+        .header h1 {
             font-size: 2.5em;
             margin-bottom: 10px;
-        }}
+        }
         
-        .header .subtitle {{
+        .header .subtitle {
             font-size: 1.2em;
             opacity: 0.9;
-        }}
+        }
         
-        .score-badge {{
+        .score-badge {
             display: inline-block;
             background: rgba(255,255,255,0.2);
             padding: 10px 20px;
@@ -61,180 +75,190 @@ def generate_html_report(report, listing, output_path: Path) -> None:
             font-size: 1.5em;
             font-weight: bold;
             margin-top: 20px;
-        }}
+        }
         
-        .property-details {{
+        .property-details {
             display: grid;
             grid-template-columns: repeat(auto-fit, minmax(200px, 1fr));
             gap: 20px;
             padding: 40px;
             background: #f8f9fa;
             border-bottom: 1px solid #e0e0e0;
-        }}
+        }
         
-        .detail-box {{
+        .detail-box {
             text-align: center;
-        }}
+        }
         
-        .detail-label {{
+        .detail-label {
             font-size: 0.9em;
             color: #666;
             text-transform: uppercase;
             letter-spacing: 1px;
             margin-bottom: 5px;
-        }}
+        }
         
-        .detail-value {{
+        .detail-value {
             font-size: 1.8em;
             font-weight: bold;
             color: #667eea;
-        }}
+        }
         
-        .loopnet-link {{
+        .loopnet-link {
             padding: 20px 40px;
             background: #fff3cd;
             border-left: 4px solid #ffc107;
-        }}
+        }
         
-        .loopnet-link a {{
+        .loopnet-link a {
             color: #0066cc;
             text-decoration: none;
             font-weight: 500;
-        }}
+        }
         
-        .loopnet-link a:hover {{
+        .loopnet-link a:hover {
             text-decoration: underline;
-        }}
+        }
         
-        .agent-section {{
+        .agent-section {
             padding: 40px;
             border-bottom: 1px solid #e0e0e0;
-        }}
+        }
         
-        .agent-header {{
+        .agent-header {
             display: flex;
             align-items: center;
             margin-bottom: 20px;
-        }}
+        }
         
-        .agent-icon {{
+        .agent-icon {
             font-size: 3em;
             margin-right: 20px;
-        }}
+        }
         
-        .agent-title {{
+        .agent-title {
             flex: 1;
-        }}
+        }
         
-        .agent-title h2 {{
+        .agent-title h2 {
             font-size: 1.8em;
             color: #333;
             margin-bottom: 5px;
-        }}
+        }
         
-        .agent-score {{
+        .agent-score {
             font-size: 2em;
             font-weight: bold;
             padding: 10px 25px;
             border-radius: 8px;
             background: #e8f5e9;
             color: #2e7d32;
-        }}
+        }
         
-        .agent-score.medium {{
+        .agent-score.medium {
             background: #fff3e0;
             color: #f57c00;
-        }}
+        }
         
-        .agent-score.low {{
+        .agent-score.low {
             background: #ffebee;
             color: #c62828;
-        }}
+        }
         
-        .rationale {{
+        .rationale {
             background: #f8f9fa;
             padding: 20px;
             border-radius: 8px;
             margin: 20px 0;
             border-left: 4px solid #667eea;
-        }}
+        }
         
-        .rationale h3 {{
+        .rationale h3 {
             color: #667eea;
             margin-bottom: 10px;
-        }}
+        }
         
-        .notes {{
+        .notes {
             list-style: none;
             padding: 0;
-        }}
+        }
         
-        .notes li {{
+        .notes li {
             padding: 12px 20px;
             margin: 8px 0;
             background: #f8f9fa;
             border-radius: 6px;
             border-left: 3px solid #667eea;
-        }}
+        }
         
-        .notes li:before {{
+        .notes li:before {
             content: "→";
             color: #667eea;
             font-weight: bold;
             margin-right: 10px;
-        }}
+        }
         
-        .memo-section {{
+        .memo-section {
             padding: 40px;
             background: #fafafa;
-        }}
+        }
         
-        .memo-section h2 {{
+        .memo-section h2 {
             font-size: 2em;
             color: #333;
             margin-bottom: 30px;
             border-bottom: 3px solid #667eea;
             padding-bottom: 10px;
-        }}
+        }
         
-        .memo-content {{
+        .memo-content {
             background: white;
             padding: 30px;
             border-radius: 8px;
             box-shadow: 0 1px 3px rgba(0,0,0,0.1);
-        }}
+        }
         
-        .footer {{
+        .footer {
             padding: 20px 40px;
             text-align: center;
             color: #666;
             font-size: 0.9em;
             background: #f8f9fa;
-        }}
+        }
         
-        @media print {{
-            body {{
+        @media print {
+            body {
                 background: white;
                 padding: 0;
-            }}
-            .container {{
+            }
+            .container {
                 box-shadow: none;
-            }}
-        }}
+            }
+        }"""
+
+# Page skeleton, parsed once at import; rendered per report with str.format
+_PAGE_HEAD = """<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>Property Analysis: {address}</title>
+    <style>
+{css}
     </style>
 </head>
 <body>
     <div class="container">
         <div class="header">
-            <h1>🏢 {report.address or "Property Analysis"}</h1>
-            <div class="subtitle">Listing ID: {report.listing_id}</div>
+            <h1>🏢 {title}</h1>
+            <div class="subtitle">Listing ID: {listing_id}</div>
             <div class="score-badge">Overall Score: {report.scores.overall}/100</div>
         </div>
         
         <div class="property-details">
             <div class="detail-box">
                 <div class="detail-label">Asking Price</div>
-                <div class="detail-value">{format_price(listing.ask_price)}</div>
+                <div class="detail-value">{price}</div>
             </div>
             <div class="detail-box">
                 <div class="detail-label">Cap Rate</div>
@@ -242,36 +266,24 @@ def generate_html_report(report, listing, output_path: Path) -> None:
             </div>
             <div class="detail-box">
                 <div class="detail-label">Units</div>
-                <div class="detail-value">{listing.units or "N/A"}</div>
+                <div class="detail-value">{units}</div>
             </div>
             <div class="detail-box">
                 <div class="detail-label">Building Size</div>
-                <div class="detail-value">{format_size(listing.building_size)}</div>
+                <div class="detail-value">{size}</div>
             </div>
             <div class="detail-box">
                 <div class="detail-label">Year Built</div>
-                <div class="detail-value">{listing.year_built or "N/A"}</div>
+                <div class="detail-value">{year_built}</div>
             </div>
         </div>
         
         <div class="loopnet-link">
-            🔗 <strong>View on LoopNet:</strong> <a href="{build_loopnet_url(listing)}" target="_blank">{build_loopnet_url(listing)}</a>
+            🔗 <strong>View on LoopNet:</strong> <a href="{loopnet_url}" target="_blank">{loopnet_url}</a>
         </div>
 """
 
-    # Add agent sections
-    agents = [
-        ("💰", "Investment Agent", report.investment_output, report.scores.investment),
-        ("📍", "Location Risk Agent", report.location_output, report.scores.location),
-        ("📰", "News/Reddit Agent", report.news_output, report.scores.news_signal),
-        ("📊", "VC Risk/Return Agent", report.vc_risk_output, report.scores.risk_return),
-        ("🏗️", "Construction Agent", report.construction_output, report.scores.construction),
-    ]
-    
-    for icon, name, output, score in agents:
-        if output:
-            score_class = "low" if score < 40 else "medium" if score < 70 else ""
-            html += f"""
+_AGENT_SECTION = """
         <div class="agent-section">
             <div class="agent-header">
                 <div class="agent-icon">{icon}</div>
@@ -283,42 +295,95 @@ def generate_html_report(report, listing, output_path: Path) -> None:
             
             <div class="rationale">
                 <h3>Analysis</h3>
-                <p>{output.rationale}</p>
+                <p>{rationale}</p>
             </div>
             
             <ul class="notes">
-"""
-            for note in output.notes:
-                html += f"                <li>{note}</li>\n"
-            
-            html += """            </ul>
+{notes}            </ul>
         </div>
 """
 
-    # Add investment memo
-    html += f"""
+_PAGE_TAIL = """
         <div class="memo-section">
             <h2>📝 Investment Memo</h2>
             <div class="memo-content">
-                {markdown_to_html(report.memo_markdown)}
+                {memo_html}
             </div>
         </div>
         
         <div class="footer">
-            Generated on {datetime.now().strftime("%B %d, %Y at %I:%M %p")}
+            Generated on {generated_on}
         </div>
     </div>
 </body>
 </html>
 """
+
+
+def generate_html_report(report, listing, output_path: Path) -> None:
+    """Generate an HTML report for a property analysis."""
+    # Stream chunks through one buffered writer instead of joining the whole page first
+    with open(output_path, "w", encoding="utf-8", buffering=_WRITE_BUFFER_SIZE) as f:
+        f.writelines(_iter_report_html(report, listing))
+
+
+def _iter_report_html(report, listing) -> Iterator[str]:
+    """
+    Yield the report page in order: head, agent sections, memo and footer.
+    
+    Listing and LLM-provided text is HTML-escaped; only the markup in this module
+    (and the rendered memo) reaches the page raw.
+    """
+    # Derive every display value once, before any markup is assembled
+    loopnet_url = build_loopnet_url(listing)
+    price_str = format_price(listing.ask_price)
+    size_str = format_size(listing.building_size)
+
+    yield _PAGE_HEAD.format(
+        css=_CSS,
+        report=report,
+        listing=listing,
+        address=escape(str(report.address)),
+        title=escape(report.address or "Property Analysis"),
+        listing_id=escape(report.listing_id),
+        price=price_str,
+        units=listing.units or "N/A",
+        size=size_str,
+        year_built=listing.year_built or "N/A",
+        loopnet_url=escape(loopnet_url),
+    )
+
+    # Add agent sections (only agents that produced output)
+    agents = [
+        ("💰", "Investment Agent", report.investment_output, report.scores.investment),
+        ("📍", "Location Risk Agent", report.location_output, report.scores.location),
+        ("📰", "News/Reddit Agent", report.news_output, report.scores.news_signal),
+        ("📊", "VC Risk/Return Agent", report.vc_risk_output, report.scores.risk_return),
+        ("🏗️", "Construction Agent", report.construction_output, report.scores.construction),
+    ]
     
-    # Write to file
-    with open(output_path, "w", encoding="utf-8") as f:
-        f.write(html)
+    present = [(icon, name, output, score) for icon, name, output, score in agents if output]
+    
+    for icon, name, output, score in present:
+        yield _AGENT_SECTION.format_map({
+            "icon": icon,
+            "name": name,
+            "score": score,
+            "score_class": _SCORE_CLASSES[score],
+            "rationale": escape(output.rationale),
+            "notes": "".join(f"                <li>{escape(note)}</li>\n" for note in output.notes),
+        })
+
+    # Add investment memo
+    yield _PAGE_TAIL.format(
+        memo_html=markdown_to_html(report.memo_markdown),
+        generated_on=datetime.now().strftime("%B %d, %Y at %I:%M %p"),
+    )
 
 
+@functools.lru_cache(maxsize=1024)
 def format_price(price: Optional[float]) -> str:
-    """Format price for display."""
+    """Format price for display (memoized: asking prices repeat across tables and reports)."""
     if price is None:
         return "N/A"
     if price >= 1_000_000:
@@ -326,8 +391,9 @@ def format_price(price: Optional[float]) -> str:
     return f"${price:,.0f}"
 
 
+@functools.lru_cache(maxsize=1024)
 def format_size(size: Optional[float]) -> str:
-    """Format building size."""
+    """Format building size (memoized like format_price)."""
     if size is None:
         return "N/A"
     return f"{size:,.0f} SF"
@@ -338,44 +404,39 @@ def build_loopnet_url(listing) -> str:
     listing_id = listing.listing_id
     
     if listing.address and listing.city and listing.state:
-        street = listing.address.replace(' ', '-').replace(',', '')
-        city_state = f"{listing.city}-{listing.state}".replace(' ', '-').replace(',', '')
+        street = listing.address.translate(_SLUG_TABLE)
+        city_state = f"{listing.city}-{listing.state}".translate(_SLUG_TABLE)
         return f"https://www.loopnet.com/Listing/{street}-{city_state}/{listing_id}/"
     
     return f"https://www.loopnet.com/Listing/{listing_id}/"
 
 
+def _render_header(match: re.Match) -> str:
+    """Render a ``##``/``###`` line as a closed <h2>/<h3> tag."""
+    level = len(match.group(1))
+    return f"<h{level}>{match.group(2)}</h{level}>"
+
+
+def _render_bullets(match: re.Match) -> str:
+    """Render a run of ``- `` lines as a single <ul> block."""
+    block = match.group(0)
+    items = "".join(f"<li>{line.strip()[2:]}</li>\n" for line in block.splitlines())
+    trailing = "\n" if block.endswith("\n") else ""
+    return f"<ul>\n{items}</ul>{trailing}"
+
+
 def markdown_to_html(markdown: str) -> str:
-    """Convert simple markdown to HTML (basic implementation)."""
-    # Replace headers
-    html = markdown.replace("### ", "<h3>").replace("\n\n", "</p><p>")
-    html = html.replace("## ", "<h2>")
-    
-    # Replace bold
-    import re
-    html = re.sub(r'\*\*(.*?)\*\*', r'<strong>\1</strong>', html)
-    
-    # Replace bullet points
-    lines = html.split('\n')
-    in_list = False
-    result = []
-    
-    for line in lines:
-        if line.strip().startswith('- '):
-            if not in_list:
-                result.append('<ul>')
-                in_list = True
-            result.append(f'<li>{line.strip()[2:]}</li>')
-        else:
-            if in_list:
-                result.append('</ul>')
-                in_list = False
-            result.append(line)
-    
-    if in_list:
-        result.append('</ul>')
-    
-    html = '\n'.join(result)
-    html = f'<p>{html}</p>'
-    
-    return html
+    """Convert the memo markdown to HTML (CommonMark via markdown-it when installed)."""
+    if _MARKDOWN is not None:
+        return _MARKDOWN.render(markdown)
+    return _basic_markdown_to_html(markdown)
+
+
+def _basic_markdown_to_html(markdown: str) -> str:
+    """Convert simple markdown (##/### headers, **bold**, - bullets) to HTML."""
+    # Escape raw markup first; the markdown syntax characters are left untouched
+    html = _BOLD_RE.sub(r"<strong>\1</strong>", escape(markdown, quote=False))
+    html = _HEADER_RE.sub(_render_header, html)
+    html = _BULLETS_RE.sub(_render_bullets, html)
+    html = html.replace("\n\n", "</p><p>")
+    return f"<p>{html}</p>"
@@ -0,0 +1,93 @@
+"""Exact-match response cache for deterministic agent prompts."""
+from __future__ import annotations
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Optional, Protocol
+
+
+def cache_key(role: str, model: str, prompt: str) -> str:
+    """Hash (agent role, model, temperature 0, rendered prompt) into a cache key."""
+    payload = json.dumps(
+        {"role": role, "model": model, "temperature": 0, "prompt": prompt},
+        sort_keys=True,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class CacheBackend(Protocol):
+    """Storage interface for cached agent responses."""
+
+    def get(self, key: str) -> Optional[str]:
+        ...
+
+    def set(self, key: str, value: str) -> None:
+        ...
+
+
+class MemoryCache:
+    """Process-local cache with optional TTL."""
+
+    def __init__(self, ttl: Optional[float] = None):
+        self.ttl = ttl
+        self._entries: dict[str, tuple[float, str]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            stored_at, value = entry
+            if self.ttl is not None and time.time() - stored_at > self.ttl:
+                del self._entries[key]
+                return None
+            return value
+
+    def set(self, key: str, value: str) -> None:
+        with self._lock:
+            self._entries[key] = (time.time(), value)
+
+
+class SqliteCache:
+    """On-disk cache shared across runs, backed by a single SQLite table."""
+
+    def __init__(self, path: str | Path, ttl: Optional[float] = None):
+        self.path = Path(path)
+        self.ttl = ttl
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        # Specialists run in worker threads, so share one connection behind a lock
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, stored_at REAL NOT NULL)"
+        )
+        self._conn.commit()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, stored_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        value, stored_at = row
+        if self.ttl is not None and time.time() - stored_at > self.ttl:
+            return None
+        return value
+
+    def set(self, key: str, value: str) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, value, stored_at) VALUES (?, ?, ?)",
+                (key, value, time.time()),
+            )
+            self._conn.commit()
+
+
+__all__ = ["cache_key", "CacheBackend", "MemoryCache", "SqliteCache"]
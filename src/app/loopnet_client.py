@@ -1,10 +1,59 @@
 """LoopNet API client with retry logic."""
+import asyncio
+import hashlib
+import json
+import re
+from itertools import chain, pairwise
+from pathlib import Path
+
 import httpx
-from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
-from typing import Optional
+from tenacity import retry, stop_after_attempt, wait_random_exponential, retry_if_exception_type
+from typing import Optional, Sequence
 
 from .config import settings
 from .models import SearchParams, Listing
+from .serialization import loads as json_loads, write_json
+
+# HTTP/2 multiplexes findCity + advanceSearch over one connection (needs `httpx[http2]`)
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+HTTP_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=50)
+
+# Larger requests are split into concurrent pages of this size by search_paged()
+MAX_PAGE_SIZE = 50
+
+
+def create_http_client(timeout: float = 30.0) -> httpx.AsyncClient:
+    """Create a pooled AsyncClient that can be shared across LoopNet calls."""
+    return httpx.AsyncClient(timeout=timeout, http2=HTTP2_AVAILABLE, limits=HTTP_LIMITS)
+
+
+def _cache_path(url: str, payload: dict) -> Path:
+    """Content-addressed cache location for a POST (url + canonical JSON payload)."""
+    key = hashlib.sha256(
+        url.encode("utf-8") + json.dumps(payload, sort_keys=True).encode("utf-8")
+    ).hexdigest()
+    return Path(settings.http_cache_dir) / key[:2] / f"{key}.json"
+
+
+# Normalized city name -> (locationId, display); city ids are stable, so share across clients
+_CITY_ID_CACHE: dict[str, tuple[str, str]] = {}
+
+# "$1.699M" / "$2.5MM" / "1,200,000" / "850K" -> (number, magnitude suffix)
+_PRICE_RE = re.compile(r"\s*\$?\s*([\d,.]+)\s*(MM|M|K|)\s*", re.IGNORECASE)
+_PRICE_MULTIPLIERS = {"": 1, "K": 1_000, "M": 1_000_000, "MM": 1_000_000}
+_PERCENT_RE = re.compile(r"\s*([-+]?[\d.]+)\s*%?\s*")
+
+# (label needle, Listing field, converter) for ["value", "label"] pairs in shortPropertyFacts
+_NESTED_FACT_HANDLERS = (
+    ("Cap Rate", "cap_rate", lambda value: LoopNetClient._parse_percentage(str(value))),
+    ("Units", "units", lambda value: LoopNetClient._safe_int(value)),
+    ("SF Bldg", "building_size", lambda value: LoopNetClient._safe_float(str(value).replace(",", ""))),
+)
 
 
 class LoopNetAPIError(Exception):
@@ -15,8 +64,16 @@ class LoopNetAPIError(Exception):
 class LoopNetClient:
     """Client for LoopNet RapidAPI with automatic retries."""
     
-    def __init__(self, api_key: Optional[str] = None):
-        """Initialize client with API key from settings or override."""
+    def __init__(self, api_key: Optional[str] = None, http: Optional[httpx.AsyncClient] = None):
+        """
+        Initialize client with API key from settings or override.
+        
+        Args:
+            api_key: Optional RapidAPI key (defaults to settings)
+            http: Optional shared AsyncClient; the caller owns its lifecycle. Without
+                one, the client creates its own pool on first use; close it with
+                ``aclose()`` or ``async with LoopNetClient() as client``.
+        """
         self.api_key = api_key or settings.rapidapi_key
         if not self.api_key or self.api_key == "__SET_ME__":
             raise ValueError("RAPIDAPI_KEY must be set in environment variables")
@@ -28,31 +85,63 @@ class LoopNetClient:
             "x-rapidapi-host": self.host,
             "x-rapidapi-key": self.api_key,
         }
+        self.http = http
+        self._owned_http: Optional[httpx.AsyncClient] = None
+    
+    async def __aenter__(self) -> "LoopNetClient":
+        return self
+    
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+    
+    async def aclose(self) -> None:
+        """Close the pooled client this instance created (an injected ``http`` is left open)."""
+        if self._owned_http is not None:
+            await self._owned_http.aclose()
+            self._owned_http = None
     
+    def _client(self) -> httpx.AsyncClient:
+        """Return the injected client, or lazily create one pool reused by every request."""
+        if self.http is not None:
+            return self.http
+        if self._owned_http is None:
+            self._owned_http = create_http_client()
+        return self._owned_http
+    
+    # Jittered backoff keeps concurrent page fetches from retrying in lockstep; transport
+    # errors cover pooled keep-alive connections the server closed between requests
     @retry(
         stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=1, max=10),
-        retry=retry_if_exception_type((httpx.HTTPStatusError, httpx.TimeoutException)),
+        wait=wait_random_exponential(multiplier=1, min=1, max=10),
+        retry=retry_if_exception_type((httpx.HTTPStatusError, httpx.TransportError)),
         reraise=True,
     )
     async def _make_request(self, endpoint: str, payload: dict) -> dict:
         """Make HTTP POST request with retry logic."""
         url = f"{self.base_url}{endpoint}"
         
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.post(url, json=payload, headers=self.headers)
-            
-            # Handle rate limiting and server errors
-            if response.status_code in [429, 500, 502, 503, 504]:
-                response.raise_for_status()
-            
-            # Handle client errors (don't retry)
-            if response.status_code >= 400:
-                raise LoopNetAPIError(
-                    f"LoopNet API error {response.status_code}: {response.text}"
-                )
-            
-            return response.json()
+        cache_path = _cache_path(url, payload) if settings.http_cache else None
+        if cache_path is not None and cache_path.exists():
+            return json_loads(cache_path.read_bytes())
+        
+        response = await self._client().post(url, json=payload, headers=self.headers)
+        
+        # Handle rate limiting and server errors
+        if response.status_code in [429, 500, 502, 503, 504]:
+            response.raise_for_status()
+        
+        # Handle client errors (don't retry)
+        if response.status_code >= 400:
+            raise LoopNetAPIError(
+                f"LoopNet API error {response.status_code}: {response.text}"
+            )
+        
+        # orjson (when installed) parses the large advanceSearch payloads much faster
+        data = json_loads(response.content)
+        if cache_path is not None:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            write_json(cache_path, data)
+        return data
     
     async def resolve_city_id(self, city_name: str) -> tuple[str, str]:
         """
@@ -62,8 +151,14 @@ class LoopNetClient:
             city_name: City name (e.g., "Los Angeles", "Miami")
         
         Returns:
-            Tuple of (locationId, display_name)
+            Tuple of (locationId, display_name); successful lookups are memoized
+            per normalized city name for the life of the process
         """
+        cache_key = city_name.strip().lower()
+        cached = _CITY_ID_CACHE.get(cache_key)
+        if cached is not None:
+            return cached
+        
         endpoint = "/loopnet/helper/findCity"
         payload = {"keywords": city_name}
         
@@ -87,6 +182,7 @@ class LoopNetClient:
             if not location_id:
                 raise LoopNetAPIError(f"Could not extract location ID for '{city_name}'")
             
+            _CITY_ID_CACHE[cache_key] = (location_id, display_name)
             return location_id, display_name
             
         except LoopNetAPIError:
@@ -108,10 +204,7 @@ class LoopNetClient:
         endpoint = "/loopnet/sale/advanceSearch"
         
         # Build payload from params, excluding None values
-        payload = {
-            k: v for k, v in params.model_dump().items()
-            if v is not None
-        }
+        payload = params.model_dump(exclude_none=True)
         
         # If city_name provided, resolve it to locationId
         if city_name:
@@ -137,6 +230,84 @@ class LoopNetClient:
         except Exception as e:
             raise LoopNetAPIError(f"Unexpected error: {e}")
     
+    async def search_many(
+        self,
+        params_list: Sequence[SearchParams],
+        city_names: Optional[Sequence[Optional[str]]] = None,
+        *,
+        max_concurrency: int = 8,
+        return_exceptions: bool = True,
+    ) -> list[list[Listing] | BaseException]:
+        """
+        Run several searches concurrently over this client's connection pool.
+        
+        Args:
+            params_list: Search parameters, one per search
+            city_names: Optional city name per search (None entries keep params.locationId)
+            max_concurrency: Upper bound on searches in flight (RapidAPI rate limits)
+            return_exceptions: Return failures in place instead of raising the first one
+        
+        Returns:
+            Listings (or exceptions) in the same order as ``params_list``
+        """
+        if city_names is None:
+            city_names = [None] * len(params_list)
+        if len(city_names) != len(params_list):
+            raise ValueError("city_names must match params_list in length")
+        
+        semaphore = asyncio.Semaphore(max_concurrency)
+        
+        async def _search(params: SearchParams, city_name: Optional[str]) -> list[Listing]:
+            async with semaphore:
+                return await self.search_properties(params, city_name=city_name)
+        
+        return await asyncio.gather(
+            *(_search(params, city) for params, city in zip(params_list, city_names)),
+            return_exceptions=return_exceptions,
+        )
+    
+    async def search_paged(
+        self,
+        params: SearchParams,
+        city_name: Optional[str] = None,
+        *,
+        page_size: int = MAX_PAGE_SIZE,
+    ) -> list[Listing]:
+        """
+        Search like ``search_properties`` but fetch large result sizes as concurrent pages.
+        
+        The requested window (``params.page`` x ``params.size``) is covered by
+        ``page_size`` pages fetched in parallel and trimmed back to the same slice.
+        
+        Args:
+            params: Search parameters (location, filters, pagination)
+            city_name: Optional city name to resolve to locationId
+            page_size: Results per upstream request
+        
+        Returns:
+            List of Listing objects
+        """
+        if params.size <= page_size:
+            return await self.search_properties(params, city_name=city_name)
+        
+        if city_name:
+            # Resolve once up front so the page requests all hit the city cache
+            await self.resolve_city_id(city_name)
+        
+        start = (params.page - 1) * params.size
+        skip = start % page_size
+        first_page = start // page_size + 1
+        page_count = -(-(skip + params.size) // page_size)
+        pages = [
+            params.model_copy(update={"page": page, "size": page_size})
+            for page in range(first_page, first_page + page_count)
+        ]
+        results = await self.search_many(
+            pages, [city_name] * page_count, return_exceptions=False
+        )
+        listings = list(chain.from_iterable(results))
+        return listings[skip:skip + params.size]
+    
     def _parse_listings(self, response_data: dict) -> list[Listing]:
         """
         Parse LoopNet API response into Listing objects.
@@ -177,29 +348,7 @@ class LoopNetClient:
             ask_price = self._parse_price(price_str)
             
             # Extract property details from shortPropertyFacts nested structure
-            cap_rate = None
-            units = None
-            building_size = None
-            year_built = None
-            
-            facts = item.get("shortPropertyFacts", [])
-            for fact_group in facts:
-                if isinstance(fact_group, list):
-                    for fact in fact_group:
-                        if isinstance(fact, str):
-                            if "%" in fact and "Cap" not in fact:
-                                cap_rate = self._parse_percentage(fact)
-                            elif "Built in" in fact:
-                                year_built = self._safe_int(fact.replace("Built in ", ""))
-                        elif isinstance(fact, list):
-                            for i, field in enumerate(fact):
-                                if isinstance(field, str):
-                                    if "Cap Rate" in field and i > 0:
-                                        cap_rate = self._parse_percentage(str(fact[i-1]))
-                                    elif "Units" in field and i > 0:
-                                        units = self._safe_int(fact[i-1])
-                                    elif "SF Bldg" in field and i > 0:
-                                        building_size = self._safe_float(str(fact[i-1]).replace(",", ""))
+            facts = self._extract_facts(item.get("shortPropertyFacts", []))
             
             # Get property type from location.availableSpace or shortPropertyFacts
             property_type = None
@@ -215,17 +364,43 @@ class LoopNetClient:
                 state=state,
                 zip_code=zip_code,
                 ask_price=ask_price,
-                building_size=building_size,
+                building_size=facts["building_size"],
                 property_type=property_type,
-                cap_rate=cap_rate,
-                year_built=year_built,
-                units=units,
+                cap_rate=facts["cap_rate"],
+                year_built=facts["year_built"],
+                units=facts["units"],
                 raw=item,  # Store full raw data for agent analysis
             )
             listings.append(listing)
         
         return listings
     
+    @classmethod
+    def _extract_facts(cls, facts) -> dict:
+        """
+        Pull cap rate, units, size and year built out of shortPropertyFacts.
+        
+        Plain strings carry the cap rate ("5.72%") or year ("Built in 1960"); nested
+        lists hold a value followed by its label, e.g. ["12", "Units"].
+        """
+        out = {"cap_rate": None, "units": None, "building_size": None, "year_built": None}
+        groups = (group for group in facts if isinstance(group, list))
+        for fact in chain.from_iterable(groups):
+            if isinstance(fact, str):
+                if "%" in fact and "Cap" not in fact:
+                    out["cap_rate"] = cls._parse_percentage(fact)
+                elif "Built in" in fact:
+                    out["year_built"] = cls._safe_int(fact.partition("Built in ")[2])
+            elif isinstance(fact, list):
+                for value, label in pairwise(fact):
+                    if not isinstance(label, str):
+                        continue
+                    for needle, key, convert in _NESTED_FACT_HANDLERS:
+                        if needle in label:
+                            out[key] = convert(value)
+                            break
+        return out
+    
     @staticmethod
     def _parse_price(price_str) -> Optional[float]:
         """Parse price string like '$1.699M' to float."""
@@ -235,15 +410,12 @@ class LoopNetClient:
             return float(price_str)
         
         # Handle strings like "$1.699M", "$2.35M", etc.
-        price_str = str(price_str).replace("$", "").replace(",", "").strip()
+        match = _PRICE_RE.fullmatch(str(price_str))
+        if match is None:
+            return None
         try:
-            if "M" in price_str.upper():
-                return float(price_str.upper().replace("M", "")) * 1_000_000
-            elif "K" in price_str.upper():
-                return float(price_str.upper().replace("K", "")) * 1_000
-            else:
-                return float(price_str)
-        except (ValueError, AttributeError):
+            return float(match.group(1).replace(",", "")) * _PRICE_MULTIPLIERS[match.group(2).upper()]
+        except ValueError:
             return None
     
     @staticmethod
@@ -251,9 +423,12 @@ class LoopNetClient:
         """Parse percentage string like '5.72%' to float."""
         if not percent_str:
             return None
+        match = _PERCENT_RE.fullmatch(str(percent_str))
+        if match is None:
+            return None
         try:
-            return float(str(percent_str).replace("%", "").strip())
-        except (ValueError, AttributeError):
+            return float(match.group(1))
+        except ValueError:
             return None
     
     @staticmethod
@@ -0,0 +1,15 @@
+"""Event-loop entry point shared by the CLI scripts."""
+import asyncio
+from typing import Any, Coroutine, TypeVar
+
+T = TypeVar("T")
+
+
+def run(coro: Coroutine[Any, Any, T]) -> T:
+    """Run a coroutine on uvloop when installed, else on the default asyncio loop."""
+    try:
+        import uvloop
+    except ImportError:  # Windows, or the optional extra isn't installed
+        return asyncio.run(coro)
+    with asyncio.Runner(loop_factory=uvloop.new_event_loop) as runner:
+        return runner.run(coro)
@@ -1,5 +1,5 @@
 """Score normalization and aggregation utilities."""
-from typing import Optional
+from typing import Iterable, Optional
 
 
 def normalize_to_100(value: Optional[float], min_val: float = 0, max_val: float = 100) -> int:
@@ -17,17 +17,19 @@ def normalize_to_100(value: Optional[float], min_val: float = 0, max_val: float
     if value is None:
         return 50  # Neutral default
     
-    # Clamp to range
-    value = max(min_val, min(max_val, value))
+    span = max_val - min_val
+    if span == 0:
+        return 50
     
-    # Normalize to 0-100
-    if max_val == min_val:
-        normalized = 50
-    else:
-        normalized = ((value - min_val) / (max_val - min_val)) * 100
+    # Clamp to range with plain comparisons (no min()/max() calls on the hot path)
+    if value > max_val:
+        value = max_val
+    if value < min_val:
+        value = min_val
     
-    # Clamp to 1-100 and round
-    return max(1, min(100, round(normalized)))
+    # Normalize to 0-100 and round; the clamped value cannot exceed 100, so only floor at 1
+    score = round(((value - min_val) / span) * 100)
+    return 1 if score < 1 else score
 
 
 def to_int_1_100(value: Optional[float]) -> int:
@@ -45,9 +47,9 @@ def to_int_1_100(value: Optional[float]) -> int:
     
     try:
         score = int(round(value))
-        return max(1, min(100, score))
     except (ValueError, TypeError):
         return 50
+    return 1 if score < 1 else 100 if score > 100 else score
 
 
 def weighted_overall(scores: dict[str, int], weights: dict[str, float]) -> int:
@@ -109,16 +111,27 @@ def calculate_confidence(scores: dict[str, int]) -> str:
     if not scores:
         return "Low"
     
-    values = list(scores.values())
-    if len(values) < 2:
+    if len(scores) < 2:
         return "Low"
     
-    # Calculate standard deviation
-    mean = sum(values) / len(values)
-    variance = sum((x - mean) ** 2 for x in values) / len(values)
-    std_dev = variance ** 0.5
-    
-    # Classify confidence based on agreement
+    return _confidence_level(_population_std_dev(scores.values()))
+
+
+def _population_std_dev(values: Iterable[float]) -> float:
+    """Population standard deviation in a single pass (Welford's algorithm)."""
+    count = 0
+    mean = 0.0
+    m2 = 0.0
+    for x in values:
+        count += 1
+        delta = x - mean
+        mean += delta / count
+        m2 += delta * (x - mean)
+    return (m2 / count) ** 0.5 if count else 0.0
+
+
+def _confidence_level(std_dev: float) -> str:
+    """Classify confidence based on agreement between agents."""
     if std_dev < 10:
         return "High"
     elif std_dev < 20:
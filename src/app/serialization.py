@@ -0,0 +1,43 @@
+"""JSON serialization helpers for persisted reports."""
+import json
+from pathlib import Path
+from typing import Any
+
+try:  # optional C-accelerated JSON; stdlib json is the fallback
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def loads(data: str | bytes) -> Any:
+    """Parse a JSON document from text or bytes."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(obj: Any) -> str:
+    """Serialize an object to compact JSON text."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
+    return json.dumps(obj, ensure_ascii=False)
+
+
+def dumps_pretty(obj: Any) -> bytes:
+    """
+    Serialize an object to indented UTF-8 JSON bytes.
+
+    Args:
+        obj: JSON-compatible data (use ``model_dump(mode="json")`` for pydantic models)
+
+    Returns:
+        Encoded JSON document
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, indent=2, ensure_ascii=False).encode("utf-8")
+
+
+def write_json(path: Path, obj: Any) -> None:
+    """Write an object to ``path`` as indented JSON in a single bytes write."""
+    Path(path).write_bytes(dumps_pretty(obj))
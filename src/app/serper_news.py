@@ -1,23 +1,32 @@
 """Minimal Serper news client used by the News agent."""
 from __future__ import annotations
 
+import logging
 import os
 import random
+import sqlite3
 import time
-from typing import Any, Dict, List
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
 
 import httpx
 
+from .config import get_settings
+from .llm_cache import SqliteCache
+from .serialization import dumps, loads
+
+logger = logging.getLogger(__name__)
+
 SERPER_NEWS_ENDPOINT = "https://google.serper.dev/news"
 _RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
 _MAX_ATTEMPTS = 3
 
 
-def _extract_items(payload: Dict[str, Any]) -> List[Dict[str, Any]]:
-    """Normalize Serper payload to the expected list of items."""
+def _extract_items(payload: Dict[str, Any], limit: int | None = None) -> List[Dict[str, Any]]:
+    """Normalize Serper payload to the expected list of items (at most ``limit``)."""
     candidates = payload.get("news") or payload.get("items") or []
     normalized: List[Dict[str, Any]] = []
-    for raw in candidates:
+    for raw in candidates[:limit]:
         normalized.append(
             {
                 "title": raw.get("title"),
@@ -30,12 +39,61 @@ def _extract_items(payload: Dict[str, Any]) -> List[Dict[str, Any]]:
     return normalized
 
 
+_CACHE_ERRORS = (OSError, sqlite3.Error)
+_cache_failed = False
+
+
+@lru_cache(maxsize=1)
+def _news_cache() -> Optional[SqliteCache]:
+    """Disk cache for Serper responses (None when disabled or unusable)."""
+    settings = get_settings()
+    if settings.news_cache_ttl <= 0:
+        return None
+    try:
+        return SqliteCache(settings.news_cache_path, ttl=settings.news_cache_ttl)
+    except _CACHE_ERRORS as exc:
+        _disable_news_cache(exc)
+        return None
+
+
+def _disable_news_cache(exc: BaseException) -> None:
+    """Log the first cache failure and serve uncached for the rest of the process."""
+    global _cache_failed
+    if not _cache_failed:
+        logger.warning("Serper news cache unavailable, fetching uncached: %s", exc)
+    _cache_failed = True
+
+
 def search_news(query: str, num: int = 8) -> Dict[str, Any]:
-    """Search Serper news API with basic retry and normalization."""
+    """Search Serper news API with basic retry, normalization and a TTL disk cache."""
     api_key = os.getenv("SERPER_API_KEY")
     if not api_key:
         return {"items": [], "note": "SERPER_API_KEY missing"}
 
+    # Nearby listings share city/type queries, so repeat lookups skip the network
+    cache = None if _cache_failed else _news_cache()
+    cache_key = f"{query}|{num}"
+    if cache is not None:
+        try:
+            hit = cache.get(cache_key)
+        except _CACHE_ERRORS as exc:
+            _disable_news_cache(exc)
+            cache = None
+        else:
+            if hit is not None:
+                return loads(hit)
+
+    result = _fetch_news(api_key, query, num)
+    if cache is not None and "note" not in result:
+        try:
+            cache.set(cache_key, dumps(result))
+        except _CACHE_ERRORS as exc:
+            _disable_news_cache(exc)
+    return result
+
+
+def _fetch_news(api_key: str, query: str, num: int) -> Dict[str, Any]:
+    """Call the Serper news endpoint, retrying transient failures."""
     headers = {
         "X-API-KEY": api_key,
         "Content-Type": "application/json",
@@ -54,7 +112,7 @@ def search_news(query: str, num: int = 8) -> Dict[str, Any]:
                 response.raise_for_status()
             response.raise_for_status()
             data = response.json()
-            return {"items": _extract_items(data)}
+            return {"items": _extract_items(data, num)}
         except httpx.HTTPStatusError as exc:
             status = exc.response.status_code if exc.response else "unknown"
             if status in _RETRY_STATUS_CODES and attempt < _MAX_ATTEMPTS:
@@ -1,7 +1,6 @@
 """CLI interface for real estate analysis."""
 import argparse
 import asyncio
-import json
 from pathlib import Path
 
 from rich.console import Console
@@ -10,9 +9,11 @@ from rich.table import Table
 
 from .app.config import settings
 from .app.filters import load_filters, save_filters, load_city_name
-from .app.models import SearchParams
+from .app.models import FilterUpdate, SearchParams
 from .app.loopnet_client import LoopNetClient, LoopNetAPIError
 from .app.crew import PropertyAnalysisCrew
+from .app.runtime import run
+from .app.serialization import write_json
 
 
 console = Console()
@@ -34,6 +35,17 @@ CLI_TO_MODEL_FIELD = {
     "auctions": "auctions",
     "exclude_pending_sales": "excludePendingSales",
 }
+CLI_FIELD_PAIRS = tuple(CLI_TO_MODEL_FIELD.items())
+
+
+def _extract_overrides(args, skip=()) -> dict:
+    """Map CLI flags that were provided to their SearchParams field names."""
+    provided = vars(args)
+    return {
+        field_name: provided[cli_attr]
+        for cli_attr, field_name in CLI_FIELD_PAIRS
+        if cli_attr not in skip and provided.get(cli_attr) is not None
+    }
 
 
 def create_results_table(reports: list) -> Table:
@@ -76,26 +88,37 @@ def create_results_table(reports: list) -> Table:
     return table
 
 
-def save_reports(reports: list, output_dir: str = "./out"):
-    """Save reports to JSON and Markdown files."""
+def _render_markdown(report) -> str:
+    """Render the Markdown memo file for a report."""
+    ask_price = f"${report.ask_price:,.0f}" if report.ask_price else "N/A"
+    return (
+        f"# Property Analysis: {report.address or report.listing_id}\n\n"
+        f"**Ask Price:** {ask_price}\n\n"
+        f"**Overall Score:** {report.scores.overall}/100\n\n"
+        "---\n\n"
+        f"{report.memo_markdown}"
+    )
+
+
+def _save_report(report, out_path: Path) -> tuple[Path, Path]:
+    """Write one report's JSON and Markdown files (blocking; runs in a worker thread)."""
+    json_file = out_path / f"listing_{report.listing_id}.json"
+    write_json(json_file, report.model_dump(mode="json"))
+    
+    md_file = out_path / f"listing_{report.listing_id}.md"
+    md_file.write_text(_render_markdown(report), encoding="utf-8")
+    return json_file, md_file
+
+
+async def save_reports(reports: list, output_dir: str = "./out"):
+    """Save reports to JSON and Markdown files, writing all reports concurrently."""
     out_path = Path(output_dir)
     out_path.mkdir(parents=True, exist_ok=True)
     
-    for report in reports:
-        # Save JSON
-        json_file = out_path / f"listing_{report.listing_id}.json"
-        with open(json_file, "w") as f:
-            json.dump(report.model_dump(), f, indent=2)
-        
-        # Save Markdown memo
-        md_file = out_path / f"listing_{report.listing_id}.md"
-        with open(md_file, "w") as f:
-            f.write(f"# Property Analysis: {report.address or report.listing_id}\n\n")
-            f.write(f"**Ask Price:** ${report.ask_price:,.0f}\n\n" if report.ask_price else "**Ask Price:** N/A\n\n")
-            f.write(f"**Overall Score:** {report.scores.overall}/100\n\n")
-            f.write("---\n\n")
-            f.write(report.memo_markdown)
-        
+    saved = await asyncio.gather(
+        *(asyncio.to_thread(_save_report, report, out_path) for report in reports)
+    )
+    for json_file, md_file in saved:
         console.print(f"[green]✓[/green] Saved {json_file.name} and {md_file.name}")
 
 
@@ -116,17 +139,14 @@ async def analyze_command(args):
     if args.use_stored:
         console.print("[bold]Using stored filters from config/filters.json[/bold]")
         search_params = load_filters()
-        overrides = {}
-        for cli_attr, field_name in CLI_TO_MODEL_FIELD.items():
-            value = getattr(args, cli_attr, None)
-            if value is None:
-                continue
-            overrides[field_name] = value
+        overrides = _extract_overrides(args)
         if overrides:
             console.print("[italic]Applying CLI overrides to stored filters...[/italic]")
-            merged = search_params.model_dump()
-            merged.update(overrides)
-            search_params = SearchParams(**merged)
+            # Validate only the changed fields, then patch them onto the stored filters
+            validated = FilterUpdate.model_validate(overrides)
+            search_params = search_params.model_copy(
+                update=validated.model_dump(exclude_unset=True)
+            )
     else:
         if not args.location_id:
             console.print("[bold red]Error:[/bold red] --location-id is required unless --use-stored is provided.")
@@ -134,13 +154,8 @@ async def analyze_command(args):
         payload = {
             "locationId": args.location_id,
             "locationType": args.location_type or "city",
+            **_extract_overrides(args, skip=("location_id", "location_type")),
         }
-        for cli_attr, field_name in CLI_TO_MODEL_FIELD.items():
-            if cli_attr in {"location_id", "location_type"}:
-                continue
-            value = getattr(args, cli_attr, None)
-            if value is not None:
-                payload[field_name] = value
         search_params = SearchParams(**payload)
 
     if args.persist_filters:
@@ -182,7 +197,8 @@ async def analyze_command(args):
     client = LoopNetClient()
     
     try:
-        listings = await client.search_properties(search_params, city_name=city_name_for_request)
+        async with client:
+            listings = await client.search_paged(search_params, city_name=city_name_for_request)
     except LoopNetAPIError as exc:
         message = str(exc)
         if "No data found" in message:
@@ -212,19 +228,24 @@ async def analyze_command(args):
     # Analyze each listing
     console.print("[bold]Step 2:[/bold] Running multi-agent analysis...\n")
     crew = PropertyAnalysisCrew()
-    reports = []
     
     with Progress() as progress:
         task = progress.add_task("[cyan]Analyzing properties...", total=len(listings))
         
-        for listing in listings:
-            try:
-                report = await crew.analyze_listing(listing)
-                reports.append(report)
-                progress.update(task, advance=1)
-            except Exception as e:
-                console.print(f"[red]Error analyzing {listing.listing_id}:[/red] {e}")
-                progress.update(task, advance=1)
+        def _on_progress(listing, result):
+            if isinstance(result, BaseException):
+                console.print(f"[red]Error analyzing {listing.listing_id}:[/red] {result}")
+            progress.update(task, advance=1)
+        
+        # Up to --concurrency listings in flight; the bar ticks as each one finishes
+        results = await crew.analyze_listings_batch(
+            listings,
+            max_concurrency=args.concurrency,
+            on_progress=_on_progress,
+            return_exceptions=True,
+            use_batch_api=args.batch_api,
+        )
+    reports = [result for result in results if not isinstance(result, BaseException)]
     
     console.print(f"\n[green]✓[/green] Analysis complete!\n")
     
@@ -236,7 +257,7 @@ async def analyze_command(args):
         
         # Save reports
         console.print("[bold]Step 3:[/bold] Saving reports...")
-        save_reports(reports, args.output_dir)
+        await save_reports(reports, args.output_dir)
         console.print(f"\n[bold green]✓ All done![/bold green] Reports saved to {args.output_dir}/")
     else:
         console.print("[yellow]No reports generated.[/yellow]")
@@ -261,11 +282,18 @@ def main():
     analyze_parser.add_argument("--use-stored", action="store_true", help="Use filters from config/filters.json (CLI values override when provided)")
     analyze_parser.add_argument("--persist-filters", action="store_true", help="Persist the effective filters back to config/filters.json")
     analyze_parser.add_argument("--output-dir", default="./out", help="Output directory for reports")
+    analyze_parser.add_argument("--concurrency", type=int, default=8, help="Listings analyzed in parallel (default: 8)")
+    analyze_parser.add_argument(
+        "--batch-api",
+        action=argparse.BooleanOptionalAction,
+        default=settings.use_batch_api,
+        help="Run specialists through the OpenAI Batch API (cheaper, may take hours; default: USE_BATCH_API)",
+    )
     
     args = parser.parse_args()
     
     if args.command == "analyze":
-        asyncio.run(analyze_command(args))
+        run(analyze_command(args))
     else:
         parser.print_help()
 
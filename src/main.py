@@ -1,15 +1,25 @@
 """FastAPI application for real estate analysis API."""
+import asyncio
+import functools
 import html
-import json
+from contextlib import asynccontextmanager
+from pathlib import Path
 from typing import Optional
 
-from fastapi import Body, FastAPI, HTTPException, Query, Request, status
+from fastapi import Body, FastAPI, HTTPException, Query, Request, Response, status
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import HTMLResponse, JSONResponse, RedirectResponse
 from pydantic import ValidationError
 
 from .app.config import settings
-from .app.filters import load_filters, update_filters, reset_filters, save_filters, load_city_name
+from .app.filters import (
+    filters_etag,
+    load_city_name,
+    load_filters,
+    reset_filters,
+    save_filters,
+    update_filters,
+)
 from .app.models import (
     SearchParams,
     FinalReport,
@@ -21,14 +31,28 @@ from .app.models import (
     FinalSummary,
     Listing,
 )
-from .app.loopnet_client import LoopNetClient, LoopNetAPIError
+from .app.loopnet_client import LoopNetClient, LoopNetAPIError, create_http_client
 from .app.crew import PropertyAnalysisCrew
+from .app.serialization import dumps_pretty, write_json
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Share one warm LoopNet connection pool and analysis crew across requests."""
+    http = app.state.http = create_http_client()
+    app.state.crew = None
+    try:
+        yield
+    finally:
+        app.state.http = app.state.crew = None
+        await http.aclose()
 
 
 app = FastAPI(
     title="Real Estate Scout API",
     description="Multi-agent property analysis using LoopNet + CrewAI",
-    version="0.1.0"
+    version="0.1.0",
+    lifespan=lifespan,
 )
 
 default_cors_origins = {
@@ -80,6 +104,19 @@ LA_DATASET_LABELS: dict[str, str] = {
 }
 
 
+def _loopnet_client(request: Request) -> LoopNetClient:
+    """LoopNet client bound to the app-wide pool (falls back to its own when not started)."""
+    return LoopNetClient(http=getattr(request.app.state, "http", None))
+
+
+def _analysis_crew(request: Request) -> PropertyAnalysisCrew:
+    """Return the app-wide analysis crew, creating it on first use."""
+    crew = getattr(request.app.state, "crew", None)
+    if crew is None:
+        crew = request.app.state.crew = PropertyAnalysisCrew()
+    return crew
+
+
 def _build_listing_preview(listing: "Listing") -> ListingPreview:
     """Transform internal Listing model into the UI-friendly preview schema."""
 
@@ -139,6 +176,75 @@ async def health_check():
     }
 
 
+_FILTER_FORM_HEAD = """<!DOCTYPE html>
+<html lang="en">
+  <head>
+    <meta charset="utf-8" />
+    <title>LoopNet Filter Manager</title>
+    <style>
+      body { font-family: 'Inter', Arial, sans-serif; background: #f4f5f7; margin: 0; padding: 32px; color: #1f2933; }
+      h1 { margin-bottom: 8px; }
+      p.lead { color: #52606d; margin-top: 0; }
+      .container { max-width: 900px; margin: 0 auto; background: white; padding: 32px; border-radius: 12px; box-shadow: 0 10px 30px rgba(15, 23, 42, 0.08); }
+      form { display: grid; grid-template-columns: repeat(auto-fit, minmax(220px, 1fr)); gap: 16px 24px; margin-top: 24px; }
+      label { display: flex; flex-direction: column; font-size: 14px; color: #334155; font-weight: 600; gap: 6px; }
+      .field-input { padding: 10px 12px; border-radius: 8px; border: 1px solid #cbd5e1; background: #f8fafc; font-size: 14px; transition: border-color 0.2s ease, box-shadow 0.2s ease; }
+      .field-input:focus { outline: none; border-color: #6366f1; box-shadow: 0 0 0 4px rgba(99, 102, 241, 0.15); background: white; }
+      .actions { grid-column: 1 / -1; display: flex; gap: 12px; margin-top: 8px; flex-wrap: wrap; }
+      button { padding: 10px 18px; border-radius: 8px; border: none; cursor: pointer; font-size: 14px; font-weight: 600; }
+      button.primary { background: linear-gradient(135deg, #6366f1, #8b5cf6); color: white; box-shadow: 0 10px 18px rgba(99, 102, 241, 0.18); }
+      button.secondary { background: #e2e8f0; color: #334155; }
+      button.secondary:hover { background: #cbd5e1; }
+      .feedback { grid-column: 1 / -1; padding: 12px 16px; border-radius: 8px; font-size: 14px; }
+      .feedback.success { background: #dcfce7; color: #065f46; }
+      .feedback.error { background: #fee2e2; color: #b91c1c; }
+      pre { background: #0f172a; color: #e2e8f0; padding: 16px; border-radius: 10px; overflow-x: auto; font-size: 13px; line-height: 1.5; grid-column: 1 / -1; }
+      .help { grid-column: 1 / -1; font-size: 13px; color: #475569; margin-bottom: 4px; }
+    </style>
+  </head>
+  <body>
+    <div class="container">
+      <h1>LoopNet Filter Manager</h1>
+      <p class="lead">Adjust the stored search filters used by the LoopNet analyzer. Leave a field blank to remove that filter.</p>
+      """
+
+# (SearchParams field, <label> row with a single {} slot for the escaped value)
+_FILTER_FORM_FIELDS = (
+    ("locationId", '        <label>Location ID<input class="field-input" name="locationId" value="{}" required /></label>\n'),
+    ("locationType", '        <label>Location Type<input class="field-input" name="locationType" value="{}" required /></label>\n'),
+    ("page", '        <label>Page<input class="field-input" type="number" name="page" min="1" value="{}" /></label>\n'),
+    ("size", '        <label>Page Size<input class="field-input" type="number" name="size" min="1" max="100" value="{}" /></label>\n'),
+    ("priceMin", '        <label>Price Min ($)<input class="field-input" type="number" step="1000" name="priceMin" value="{}" /></label>\n'),
+    ("priceMax", '        <label>Price Max ($)<input class="field-input" type="number" step="1000" name="priceMax" value="{}" /></label>\n'),
+    ("buildingSizeMin", '        <label>Building Size Min (SF)<input class="field-input" type="number" step="100" name="buildingSizeMin" value="{}" /></label>\n'),
+    ("buildingSizeMax", '        <label>Building Size Max (SF)<input class="field-input" type="number" step="100" name="buildingSizeMax" value="{}" /></label>\n'),
+    ("propertyType", '        <label>Property Type<input class="field-input" name="propertyType" value="{}" /></label>\n'),
+    ("capRateMin", '        <label>Cap Rate Min (%)<input class="field-input" type="number" step="0.1" name="capRateMin" value="{}" /></label>\n'),
+    ("capRateMax", '        <label>Cap Rate Max (%)<input class="field-input" type="number" step="0.1" name="capRateMax" value="{}" /></label>\n'),
+    ("yearBuiltMin", '        <label>Year Built Min<input class="field-input" type="number" name="yearBuiltMin" value="{}" /></label>\n'),
+    ("yearBuiltMax", '        <label>Year Built Max<input class="field-input" type="number" name="yearBuiltMax" value="{}" /></label>\n'),
+)
+
+_FILTER_FORM_ACTIONS = """        <div class="help">Use the buttons below to save changes or reset to defaults.</div>
+                <div class="actions">
+                    <button type="submit" class="primary">Save Filters</button>
+                    <button type="submit" class="secondary" formaction="/filters/ui/reset" formmethod="post">Reset Defaults</button>
+                </div>
+      </form>
+      <h2>Current Configuration</h2>
+      <pre>"""
+
+_FILTER_FORM_TAIL = """</pre>
+    </div>
+  </body>
+</html>
+"""
+
+# Form keys accepted by filters_ui_submit
+_FILTER_UPDATE_FIELDS = frozenset(FilterUpdate.model_fields)
+
+
+@functools.lru_cache(maxsize=None)
 def _render_bool_select(name: str, current: Optional[bool]) -> str:
     current_value = "" if current is None else ("true" if current else "false")
     options = [
@@ -154,85 +260,48 @@ def _render_bool_select(name: str, current: Optional[bool]) -> str:
 
 
 def _render_filter_form(filters: SearchParams, message: Optional[str] = None, error: Optional[str] = None) -> str:
+    """Render the filter editor; only the feedback, field values and JSON preview vary."""
     data = filters.model_dump()
 
-    def val(field: str) -> str:
-        value = data.get(field)
-        return "" if value is None else str(value)
-
-    feedback_block = ""
+    parts = [_FILTER_FORM_HEAD]
     if message:
-        feedback_block = f'<div class="feedback success">{html.escape(message)}</div>'
+        parts.append(f'<div class="feedback success">{html.escape(message)}</div>')
     if error:
-        feedback_block += f'<div class="feedback error">{html.escape(error)}</div>'
+        parts.append(f'<div class="feedback error">{html.escape(error)}</div>')
+    parts.append('\n      <form method="post" action="/filters/ui">\n')
+    for field, row in _FILTER_FORM_FIELDS:
+        value = data.get(field)
+        parts.append(row.format(html.escape("" if value is None else str(value))))
+    parts.append(f"        <label>Include Auctions{_render_bool_select('auctions', filters.auctions)}</label>\n")
+    parts.append(
+        "        <label>Exclude Pending Sales"
+        f"{_render_bool_select('excludePendingSales', filters.excludePendingSales)}</label>\n"
+    )
+    parts.append(_FILTER_FORM_ACTIONS)
+    parts.append(html.escape(dumps_pretty(data).decode("utf-8"), quote=False))
+    parts.append(_FILTER_FORM_TAIL)
+    return "".join(parts)
 
-    filters_json = html.escape(json.dumps(data, indent=2), quote=False)
 
-    return f"""<!DOCTYPE html>
-<html lang=\"en\">
-  <head>
-    <meta charset=\"utf-8\" />
-    <title>LoopNet Filter Manager</title>
-    <style>
-      body {{ font-family: 'Inter', Arial, sans-serif; background: #f4f5f7; margin: 0; padding: 32px; color: #1f2933; }}
-      h1 {{ margin-bottom: 8px; }}
-      p.lead {{ color: #52606d; margin-top: 0; }}
-      .container {{ max-width: 900px; margin: 0 auto; background: white; padding: 32px; border-radius: 12px; box-shadow: 0 10px 30px rgba(15, 23, 42, 0.08); }}
-      form {{ display: grid; grid-template-columns: repeat(auto-fit, minmax(220px, 1fr)); gap: 16px 24px; margin-top: 24px; }}
-      label {{ display: flex; flex-direction: column; font-size: 14px; color: #334155; font-weight: 600; gap: 6px; }}
-      .field-input {{ padding: 10px 12px; border-radius: 8px; border: 1px solid #cbd5e1; background: #f8fafc; font-size: 14px; transition: border-color 0.2s ease, box-shadow 0.2s ease; }}
-      .field-input:focus {{ outline: none; border-color: #6366f1; box-shadow: 0 0 0 4px rgba(99, 102, 241, 0.15); background: white; }}
-      .actions {{ grid-column: 1 / -1; display: flex; gap: 12px; margin-top: 8px; flex-wrap: wrap; }}
-      button {{ padding: 10px 18px; border-radius: 8px; border: none; cursor: pointer; font-size: 14px; font-weight: 600; }}
-      button.primary {{ background: linear-gradient(135deg, #6366f1, #8b5cf6); color: white; box-shadow: 0 10px 18px rgba(99, 102, 241, 0.18); }}
-      button.secondary {{ background: #e2e8f0; color: #334155; }}
-      button.secondary:hover {{ background: #cbd5e1; }}
-      .feedback {{ grid-column: 1 / -1; padding: 12px 16px; border-radius: 8px; font-size: 14px; }}
-      .feedback.success {{ background: #dcfce7; color: #065f46; }}
-      .feedback.error {{ background: #fee2e2; color: #b91c1c; }}
-      pre {{ background: #0f172a; color: #e2e8f0; padding: 16px; border-radius: 10px; overflow-x: auto; font-size: 13px; line-height: 1.5; grid-column: 1 / -1; }}
-      .help {{ grid-column: 1 / -1; font-size: 13px; color: #475569; margin-bottom: 4px; }}
-    </style>
-  </head>
-  <body>
-    <div class=\"container\">
-      <h1>LoopNet Filter Manager</h1>
-      <p class=\"lead\">Adjust the stored search filters used by the LoopNet analyzer. Leave a field blank to remove that filter.</p>
-      {feedback_block}
-      <form method=\"post\" action=\"/filters/ui\">
-        <label>Location ID<input class=\"field-input\" name=\"locationId\" value=\"{html.escape(val('locationId'))}\" required /></label>
-        <label>Location Type<input class=\"field-input\" name=\"locationType\" value=\"{html.escape(val('locationType'))}\" required /></label>
-        <label>Page<input class=\"field-input\" type=\"number\" name=\"page\" min=\"1\" value=\"{html.escape(val('page'))}\" /></label>
-        <label>Page Size<input class=\"field-input\" type=\"number\" name=\"size\" min=\"1\" max=\"100\" value=\"{html.escape(val('size'))}\" /></label>
-        <label>Price Min ($)<input class=\"field-input\" type=\"number\" step=\"1000\" name=\"priceMin\" value=\"{html.escape(val('priceMin'))}\" /></label>
-        <label>Price Max ($)<input class=\"field-input\" type=\"number\" step=\"1000\" name=\"priceMax\" value=\"{html.escape(val('priceMax'))}\" /></label>
-        <label>Building Size Min (SF)<input class=\"field-input\" type=\"number\" step=\"100\" name=\"buildingSizeMin\" value=\"{html.escape(val('buildingSizeMin'))}\" /></label>
-        <label>Building Size Max (SF)<input class=\"field-input\" type=\"number\" step=\"100\" name=\"buildingSizeMax\" value=\"{html.escape(val('buildingSizeMax'))}\" /></label>
-        <label>Property Type<input class=\"field-input\" name=\"propertyType\" value=\"{html.escape(val('propertyType'))}\" /></label>
-        <label>Cap Rate Min (%)<input class=\"field-input\" type=\"number\" step=\"0.1\" name=\"capRateMin\" value=\"{html.escape(val('capRateMin'))}\" /></label>
-        <label>Cap Rate Max (%)<input class=\"field-input\" type=\"number\" step=\"0.1\" name=\"capRateMax\" value=\"{html.escape(val('capRateMax'))}\" /></label>
-        <label>Year Built Min<input class=\"field-input\" type=\"number\" name=\"yearBuiltMin\" value=\"{html.escape(val('yearBuiltMin'))}\" /></label>
-        <label>Year Built Max<input class=\"field-input\" type=\"number\" name=\"yearBuiltMax\" value=\"{html.escape(val('yearBuiltMax'))}\" /></label>
-        <label>Include Auctions{_render_bool_select('auctions', filters.auctions)}</label>
-        <label>Exclude Pending Sales{_render_bool_select('excludePendingSales', filters.excludePendingSales)}</label>
-        <div class=\"help\">Use the buttons below to save changes or reset to defaults.</div>
-                <div class=\"actions\">
-                    <button type=\"submit\" class=\"primary\">Save Filters</button>
-                    <button type=\"submit\" class=\"secondary\" formaction=\"/filters/ui/reset\" formmethod=\"post\">Reset Defaults</button>
-                </div>
-      </form>
-      <h2>Current Configuration</h2>
-      <pre>{filters_json}</pre>
-    </div>
-  </body>
-</html>
-"""
+def _filters_not_modified(request: Request) -> Optional[Response]:
+    """Return a 304 when the client's cached copy matches the stored filters."""
+    etag = filters_etag()
+    if etag is not None and request.headers.get("if-none-match") == etag:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    return None
 
 
 @app.get("/filters", response_model=SearchParams)
-async def get_filters():
+async def get_filters(request: Request, response: Response):
     """Return the currently stored filters."""
-    return load_filters()
+    not_modified = _filters_not_modified(request)
+    if not_modified is not None:
+        return not_modified
+    filters = load_filters()
+    etag = filters_etag()
+    if etag is not None:
+        response.headers["ETag"] = etag
+    return filters
 
 
 @app.post("/filters", response_model=SearchParams)
@@ -254,6 +323,9 @@ async def reset_filters_route():
 @app.get("/filters/ui", response_class=HTMLResponse)
 async def filters_ui(request: Request):
     """Render HTML filter editor."""
+    not_modified = _filters_not_modified(request)
+    if not_modified is not None:
+        return not_modified
     saved_state = request.query_params.get("saved")
     message = None
     if saved_state == "1":
@@ -261,19 +333,19 @@ async def filters_ui(request: Request):
     elif saved_state == "reset":
         message = "Filters reset to defaults."
     content = _render_filter_form(load_filters(), message=message)
-    return HTMLResponse(content=content)
+    etag = filters_etag()
+    return HTMLResponse(content=content, headers={"ETag": etag} if etag else None)
 
 
 @app.post("/filters/ui")
 async def filters_ui_submit(request: Request):
     """Handle HTML form submissions for filter updates."""
     form = await request.form()
-    payload = {}
-    for field in FilterUpdate.model_fields.keys():
-        if field not in form:
-            continue
-        value = form[field]
-        payload[field] = None if value == "" else value
+    payload = {
+        field: None if value == "" else value
+        for field, value in form.items()
+        if field in _FILTER_UPDATE_FIELDS
+    }
     try:
         update_model = FilterUpdate(**payload)
         update_filters(update_model.model_dump(exclude_unset=True))
@@ -292,6 +364,7 @@ async def filters_ui_reset():
 
 @app.get("/search", response_model=list[ListingPreview])
 async def search_properties_endpoint(
+    http_request: Request,
     city_name: Optional[str] = Query(default=None, alias="cityName"),
     location_id: Optional[str] = Query(default=None, alias="locationId"),
     location_type: str = Query(default="city", alias="locationType"),
@@ -335,11 +408,12 @@ async def search_properties_endpoint(
         excludePendingSales=exclude_pending_sales,
     )
 
-    client = LoopNetClient()
+    client = _loopnet_client(http_request)
     active_city = city_name or load_city_name()
 
     try:
-        listings = await client.search_properties(search_params, city_name=active_city)
+        async with client:
+            listings = await client.search_properties(search_params, city_name=active_city)
     except LoopNetAPIError as exc:
         raise HTTPException(status_code=502, detail=f"LoopNet API error: {exc}")
     except Exception as exc:  # pragma: no cover - defensive
@@ -349,7 +423,7 @@ async def search_properties_endpoint(
 
 
 @app.post("/analyze/listings", response_model=list[AnalysisPayload])
-async def analyze_selected_listings(request: AnalyzeSelectionRequest):
+async def analyze_selected_listings(request: AnalyzeSelectionRequest, http_request: Request):
     """Analyze specific listings selected in the UI with chosen crews."""
 
     if not request.listingIds:
@@ -383,9 +457,10 @@ async def analyze_selected_listings(request: AnalyzeSelectionRequest):
     filters = request.filters or load_filters()
     active_city = request.cityName or (request.filters is None and load_city_name()) or None
 
-    client = LoopNetClient()
+    client = _loopnet_client(http_request)
     try:
-        listings = await client.search_properties(filters, city_name=active_city)
+        async with client:
+            listings = await client.search_properties(filters, city_name=active_city)
     except LoopNetAPIError as exc:
         raise HTTPException(status_code=502, detail=f"LoopNet API error: {exc}")
     except Exception as exc:  # pragma: no cover - defensive
@@ -396,7 +471,8 @@ async def analyze_selected_listings(request: AnalyzeSelectionRequest):
     if missing:
         raise HTTPException(status_code=404, detail={"missingListingIds": missing})
 
-    crew = PropertyAnalysisCrew()
+    # The app-wide crew is shared by concurrent requests; give this one its own agents
+    crew = _analysis_crew(http_request).with_fresh_agents()
     results: list[AnalysisPayload] = []
 
     for listing_id in request.listingIds:
@@ -462,11 +538,18 @@ async def analyze_selected_listings(request: AnalyzeSelectionRequest):
     return results
 
 
+def _persist_report(out_dir: Path, report: FinalReport) -> None:
+    """Write one report as JSON under ``out_dir`` (blocking; runs in a worker thread)."""
+    write_json(out_dir / f"{report.listing_id}.json", report.model_dump(mode="json"))
+
+
 @app.post("/analyze", response_model=list[FinalReport])
 async def analyze_properties(
+    http_request: Request,
     params: Optional[SearchParams] = Body(default=None),
     use_stored: bool = False,
     persist_filters: bool = False,
+    concurrency: int = Query(default=8, ge=1, le=32),
 ):
     """
     Analyze commercial properties from LoopNet.
@@ -474,10 +557,11 @@ async def analyze_properties(
     **Query Parameters:**
     - `use_stored`: Use the saved filters even if a request body is supplied (defaults to `false`)
     - `persist_filters`: Persist the effective filters back to storage when providing a body
+    - `concurrency`: Listings analyzed in parallel (defaults to `8`, max `32`)
 
     **Process:**
     1. Query LoopNet API with search parameters
-    2. Run multi-agent analysis on each listing
+    2. Run multi-agent analysis on the listings concurrently
     3. Return scored reports with investment memos
     
     **Example Request:**
@@ -520,14 +604,15 @@ async def analyze_properties(
         )
     
     # Fetch listings from LoopNet
-    client = LoopNetClient()
+    client = _loopnet_client(http_request)
     try:
         # Check if cityName is provided in filters.json
         city_name = load_city_name()
         if city_name:
             print(f"🔍 Resolving city name: {city_name}")
         
-        listings = await client.search_properties(search_params, city_name=city_name)
+        async with client:
+            listings = await client.search_paged(search_params, city_name=city_name)
         
         if city_name:
             print(f"✅ Found {len(listings)} listings")
@@ -543,30 +628,47 @@ async def analyze_properties(
     if not listings:
         return []
     
+    # Persist each report as soon as its analysis finishes so disk writes overlap
+    # with the LLM calls still in flight
+    out_dir = Path.cwd() / "out"
+    try:
+        out_dir.mkdir(parents=True, exist_ok=True)
+    except OSError as e:
+        print(f"❌ Failed to save reports: {e}")
+        out_dir = None
+    write_tasks = []
+
+    def _persist_when_done(listing, result):
+        if out_dir is not None and not isinstance(result, BaseException):
+            write_tasks.append(
+                asyncio.create_task(asyncio.to_thread(_persist_report, out_dir, result))
+            )
+
     # Analyze each listing with multi-agent crew
-    crew = PropertyAnalysisCrew()
+    crew = _analysis_crew(http_request)
+    results = await crew.analyze_listings_batch(
+        listings,
+        max_concurrency=concurrency,
+        on_progress=_persist_when_done,
+        return_exceptions=True,
+    )
     reports = []
     
-    for listing in listings:
-        try:
-            report = await crew.analyze_listing(listing)
-            reports.append(report)
-        except Exception as e:
-            print(f"Error analyzing listing {listing.listing_id}: {e}")
+    for listing, result in zip(listings, results):
+        if isinstance(result, BaseException):
+            print(f"Error analyzing listing {listing.listing_id}: {result}")
             continue
+        reports.append(result)
     
-    # Persist each report to disk for later review
-    try:
-        from pathlib import Path
-        out_dir = Path.cwd() / "out"
-        out_dir.mkdir(parents=True, exist_ok=True)
-        for report in reports:
-            file_path = out_dir / f"{report.listing_id}.json"
-            with open(file_path, "w", encoding="utf-8") as f:
-                f.write(report.model_dump_json(indent=2))
+    write_errors = [
+        outcome
+        for outcome in await asyncio.gather(*write_tasks, return_exceptions=True)
+        if isinstance(outcome, BaseException)
+    ]
+    if write_errors:
+        print(f"❌ Failed to save reports: {write_errors[0]}")
+    elif out_dir is not None:
         print(f"✅ Saved {len(reports)} reports to: {out_dir}")
-    except Exception as e:
-        print(f"❌ Failed to save reports: {e}")
     
     return reports
 
@@ -340,7 +340,8 @@ async def search_properties_endpoint(
     active_city = city_name or load_city_name()
 
     try:
-        listings = await client.search_properties(search_params, city_name=active_city)
+        async with client:
+            listings = await client.search_properties(search_params, city_name=active_city)
     except LoopNetAPIError as exc:
         raise HTTPException(status_code=502, detail=f"LoopNet API error: {exc}")
     except Exception as exc:  # pragma: no cover
@@ -378,7 +379,8 @@ async def analyze_selected_listings(request: AnalyzeSelectionRequest = Body(...)
 
     client = LoopNetClient()
     try:
-        listings = await client.search_properties(filters, city_name=active_city)
+        async with client:
+            listings = await client.search_properties(filters, city_name=active_city)
     except LoopNetAPIError as exc:
         raise HTTPException(status_code=502, detail=f"LoopNet API error: {exc}")
     except Exception as exc:  # pragma: no cover
@@ -415,7 +417,8 @@ async def analyze_properties(
     client = LoopNetClient()
     city_name = load_city_name()
     try:
-        listings = await client.search_properties(filters, city_name=city_name)
+        async with client:
+            listings = await client.search_properties(filters, city_name=city_name)
     except LoopNetAPIError as exc:
         raise HTTPException(status_code=502, detail=f"LoopNet API error: {exc}")
 
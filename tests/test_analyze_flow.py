@@ -1,11 +1,15 @@
 """End-to-end analysis flow test with mocked dependencies."""
+import asyncio
 import json
 
 from fastapi.testclient import TestClient
+from httpx import ASGITransport, AsyncClient
 import pytest
 
 from src.main import app
 from src.app import filters as filter_store
+from src.app import serper_news
+from src.app.config import settings
 from src.app.loopnet_client import LoopNetAPIError
 from src.app.models import (
     AgentOutput,
@@ -15,33 +19,20 @@ from src.app.models import (
 )
 
 
-def test_analyze_uses_stored_filters(monkeypatch, tmp_path):
-    """Ensure /analyze uses stored filters and integrates mocked services."""
-    # Redirect filter storage to a temp file
-    filters_file = tmp_path / "filters.json"
-    filters_file.write_text(json.dumps({"locationId": "41096", "locationType": "city"}), encoding="utf-8")
-    monkeypatch.setattr(filter_store, "_FILTERS_FILE", filters_file)
+def _post_analyze(**params):
+    """POST /analyze in-process over ASGI (no TestClient worker thread)."""
 
-    # Provide fake API keys so the endpoint passes validation
-    monkeypatch.setenv("RAPIDAPI_KEY", "test-rapid")
-    monkeypatch.setenv("OPENAI_API_KEY", "test-openai")
-    from src.app.config import settings
+    async def _post():
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+            return await client.post("/analyze", params=params)
 
-    settings.rapidapi_key = "test-rapid"
-    settings.openai_api_key = "test-openai"
+    return asyncio.run(_post())
 
-    # Track Serper calls
-    serper_calls: dict[str, tuple[str, int]] = {}
-
-    def fake_serper(query: str, num: int = 8):
-        serper_calls["latest"] = (query, num)
-        return {"items": [{"title": "Mock Headline", "date": "2024-05-01"}]}
-
-    from src.app import serper_news
-
-    monkeypatch.setattr(serper_news, "search_news", fake_serper)
 
-    sample_listing = Listing(
+@pytest.fixture(scope="session")
+def sample_listing() -> Listing:
+    """Listing returned by the mocked LoopNet search."""
+    return Listing(
         listing_id="LN-1",
         address="123 Main St",
         city="Austin",
@@ -50,14 +41,11 @@ def test_analyze_uses_stored_filters(monkeypatch, tmp_path):
         raw={"source": "mock"},
     )
 
-    async def fake_loopnet(self, params, city_name=None):  # noqa: D401 - simple mock
-        if city_name:
-            serper_calls["city_override"] = city_name
-        return [sample_listing]
 
-    monkeypatch.setattr("src.app.loopnet_client.LoopNetClient.search_properties", fake_loopnet)
-
-    sample_report = FinalReport(
+@pytest.fixture(scope="session")
+def sample_report() -> FinalReport:
+    """Report returned by the mocked crew analysis."""
+    return FinalReport(
         listing_id="LN-1",
         address="123 Main St",
         ask_price=1_000_000,
@@ -98,17 +86,46 @@ def test_analyze_uses_stored_filters(monkeypatch, tmp_path):
         ),
     )
 
-    async def fake_analyze(self, listing):  # noqa: D401 - simple mock
-        # Invoke the patched Serper helper to mirror real flow
-        from src.app import serper_news as serper_module
 
-        serper_module.search_news(f"{listing.city} {listing.state}", 5)
+def test_analyze_uses_stored_filters(monkeypatch, tmp_path, sample_listing, sample_report):
+    """Ensure /analyze uses stored filters and integrates mocked services."""
+    monkeypatch.chdir(tmp_path)  # /analyze persists reports under ./out
+    # Redirect filter storage to a temp file
+    filters_file = tmp_path / "filters.json"
+    filters_file.write_text(json.dumps({"locationId": "41096", "locationType": "city"}), encoding="utf-8")
+    monkeypatch.setattr(filter_store, "_FILTERS_FILE", filters_file)
+
+    # Provide fake API keys so the endpoint passes validation
+    monkeypatch.setenv("RAPIDAPI_KEY", "test-rapid")
+    monkeypatch.setenv("OPENAI_API_KEY", "test-openai")
+
+    settings.rapidapi_key = "test-rapid"
+    settings.openai_api_key = "test-openai"
+
+    # Track Serper calls
+    serper_calls: dict[str, tuple[str, int]] = {}
+
+    def fake_serper(query: str, num: int = 8):
+        serper_calls["latest"] = (query, num)
+        return {"items": [{"title": "Mock Headline", "date": "2024-05-01"}]}
+
+    monkeypatch.setattr(serper_news, "search_news", fake_serper)
+
+    async def fake_loopnet(self, params, city_name=None):  # noqa: D401 - simple mock
+        if city_name:
+            serper_calls["city_override"] = city_name
+        return [sample_listing]
+
+    monkeypatch.setattr("src.app.loopnet_client.LoopNetClient.search_properties", fake_loopnet)
+
+    async def fake_analyze(self, listing, enabled_agents=None):  # noqa: D401 - simple mock
+        # Invoke the patched Serper helper to mirror real flow
+        serper_news.search_news(f"{listing.city} {listing.state}", 5)
         return sample_report
 
     monkeypatch.setattr("src.app.crew.PropertyAnalysisCrew.analyze_listing", fake_analyze)
 
-    client = TestClient(app)
-    response = client.post("/analyze?use_stored=true")
+    response = _post_analyze(use_stored="true")
 
     if response.status_code != 200:
         pytest.fail(f"Unexpected status {response.status_code}: {response.text}")
@@ -129,6 +146,7 @@ def test_analyze_uses_stored_filters(monkeypatch, tmp_path):
 
 def test_analyze_supports_nationwide(monkeypatch, tmp_path):
     """Ensure /analyze works when no city/location is supplied."""
+    monkeypatch.chdir(tmp_path)  # /analyze persists reports under ./out
 
     filters_file = tmp_path / "filters.json"
     filters_file.write_text(
@@ -149,7 +167,6 @@ def test_analyze_supports_nationwide(monkeypatch, tmp_path):
 
     monkeypatch.setenv("RAPIDAPI_KEY", "test-rapid")
     monkeypatch.setenv("OPENAI_API_KEY", "test-openai")
-    from src.app.config import settings
 
     settings.rapidapi_key = "test-rapid"
     settings.openai_api_key = "test-openai"
@@ -160,8 +177,6 @@ def test_analyze_supports_nationwide(monkeypatch, tmp_path):
         serper_calls["latest"] = (query, num)
         return {"items": []}
 
-    from src.app import serper_news
-
     monkeypatch.setattr(serper_news, "search_news", fake_serper)
 
     sample_listing = Listing(
@@ -223,13 +238,12 @@ def test_analyze_supports_nationwide(monkeypatch, tmp_path):
         ),
     )
 
-    async def fake_analyze(self, listing):  # noqa: D401 - simple mock
+    async def fake_analyze(self, listing, enabled_agents=None):  # noqa: D401 - simple mock
         return sample_report
 
     monkeypatch.setattr("src.app.crew.PropertyAnalysisCrew.analyze_listing", fake_analyze)
 
-    client = TestClient(app)
-    response = client.post("/analyze?use_stored=true")
+    response = _post_analyze(use_stored="true")
 
     if response.status_code != 200:
         pytest.fail(f"Unexpected status {response.status_code}: {response.text}")
@@ -248,6 +262,7 @@ def test_analyze_supports_nationwide(monkeypatch, tmp_path):
 
 def test_analyze_handles_no_data(monkeypatch, tmp_path):
     """Return empty list when LoopNet reports no data found."""
+    monkeypatch.chdir(tmp_path)  # /analyze persists reports under ./out
 
     filters_file = tmp_path / "filters.json"
     filters_file.write_text(json.dumps({"size": 5}), encoding="utf-8")
@@ -255,7 +270,6 @@ def test_analyze_handles_no_data(monkeypatch, tmp_path):
 
     monkeypatch.setenv("RAPIDAPI_KEY", "test-rapid")
     monkeypatch.setenv("OPENAI_API_KEY", "test-openai")
-    from src.app.config import settings
 
     settings.rapidapi_key = "test-rapid"
     settings.openai_api_key = "test-openai"
@@ -265,13 +279,42 @@ def test_analyze_handles_no_data(monkeypatch, tmp_path):
 
     monkeypatch.setattr("src.app.loopnet_client.LoopNetClient.search_properties", fake_loopnet)
 
-    async def fake_analyze(self, listing):  # pragma: no cover - shouldn't run
+    async def fake_analyze(self, listing, enabled_agents=None):  # pragma: no cover - shouldn't run
         raise AssertionError("Analyze should not be called when no listings are returned")
 
     monkeypatch.setattr("src.app.crew.PropertyAnalysisCrew.analyze_listing", fake_analyze)
 
-    client = TestClient(app)
-    response = client.post("/analyze?use_stored=true")
+    response = _post_analyze(use_stored="true")
 
     assert response.status_code == 200
     assert response.json() == []
+
+
+def test_lifespan_shares_http_pool(monkeypatch, tmp_path):
+    """The app lifespan hands every request the same HTTP pool and releases it on shutdown."""
+    monkeypatch.chdir(tmp_path)  # /analyze persists reports under ./out
+
+    filters_file = tmp_path / "filters.json"
+    filters_file.write_text(json.dumps({"size": 5}), encoding="utf-8")
+    monkeypatch.setattr(filter_store, "_FILTERS_FILE", filters_file)
+
+    monkeypatch.setattr(settings, "rapidapi_key", "test-rapid")
+    monkeypatch.setattr(settings, "openai_api_key", "test-openai")
+
+    pools = []
+
+    async def fake_loopnet(self, params, city_name=None):  # noqa: D401 - simple mock
+        pools.append(self._client())
+        return []
+
+    monkeypatch.setattr("src.app.loopnet_client.LoopNetClient.search_properties", fake_loopnet)
+
+    with TestClient(app) as client:
+        shared = app.state.http
+        assert client.post("/analyze?use_stored=true").json() == []
+        assert client.post("/analyze?use_stored=true").json() == []
+
+    assert pools == [shared, shared]
+    assert shared.is_closed
+    assert app.state.http is None
+    assert app.state.crew is None
@@ -0,0 +1,281 @@
+"""Tests for PropertyAnalysisCrew specialist orchestration with stubbed CrewAI."""
+import asyncio
+import json
+import types
+
+import pytest
+
+from src.app import crew as crew_module
+from src.app.crew import PropertyAnalysisCrew, SpecialistResult
+from src.app.models import AgentOutput, Listing
+from src.app.scoring import weighted_overall
+
+
+class FakeCrew:
+    """Single-task crew that answers with a fixed score per agent role."""
+
+    scores = {
+        "Long-Term Investment Analyst": 81,
+        "Location & Trajectory Analyst": 64,
+        "Risk/Return Architect": 58,
+        "Construction Scope & Cost Analyst": 72,
+        "News & Community Signals Analyst": 67,
+    }
+
+    def __init__(self, agents, tasks, verbose=False):
+        self.agents = agents
+        self.tasks = tasks
+
+    def kickoff(self):
+        score = self.scores.get(self.agents[0].config["role"], 50)
+        raw = json.dumps({"score_1_to_100": score, "rationale": "ok", "notes": ["n1"]})
+        return types.SimpleNamespace(tasks_output=[types.SimpleNamespace(raw=raw)])
+
+
+def _listing() -> Listing:
+    return Listing(
+        listing_id="LN-9",
+        address="9 Elm St",
+        city="Austin",
+        state="TX",
+        ask_price=900_000,
+    )
+
+
+def test_run_specialists_runs_each_enabled_agent(monkeypatch):
+    monkeypatch.setattr(crew_module, "Crew", FakeCrew)
+    crew = PropertyAnalysisCrew()
+
+    result = asyncio.run(
+        crew.run_specialists(_listing(), ["investment", "location", "vc_risk", "construction"])
+    )
+
+    assert result.outputs["investment"].score_1_to_100 == 81
+    assert result.outputs["location"].score_1_to_100 == 64
+    assert result.outputs["vc_risk"].score_1_to_100 == 58
+    assert result.outputs["construction"].score_1_to_100 == 72
+    # News was not selected, so it falls back to the neutral skipped output
+    assert result.outputs["news"].score_1_to_100 == 50
+    assert result.raw_outputs["news"] == "Agent skipped"
+
+
+def test_run_specialists_isolates_failing_agent(monkeypatch):
+    class FlakyCrew(FakeCrew):
+        def kickoff(self):
+            if self.agents[0].config["role"].startswith("Location"):
+                raise RuntimeError("LLM timeout")
+            return super().kickoff()
+
+    monkeypatch.setattr(crew_module, "Crew", FlakyCrew)
+    crew = PropertyAnalysisCrew()
+
+    result = asyncio.run(crew.run_specialists(_listing(), ["investment", "location"]))
+
+    assert result.outputs["investment"].score_1_to_100 == 81
+    assert result.outputs["location"].score_1_to_100 == 50
+    assert result.raw_outputs["location"] == "Agent output missing"
+
+
+def test_run_specialists_runs_news_after_serper_prefetch(monkeypatch):
+    monkeypatch.setattr(crew_module, "Crew", FakeCrew)
+    monkeypatch.setattr(
+        crew_module,
+        "search_news",
+        lambda query, num: {"items": [{"title": "Austin rezoning approved", "source": "KXAN"}]},
+    )
+    crew = PropertyAnalysisCrew()
+
+    result = asyncio.run(crew.run_specialists(_listing(), ["investment", "news"]))
+
+    assert result.outputs["investment"].score_1_to_100 == 81
+    assert result.outputs["news"].score_1_to_100 == 67
+    assert "Austin rezoning approved" in result.news_context
+    assert result.serper_missing is False
+
+
+def test_run_specialists_serper_missing_uses_neutral_news(monkeypatch):
+    monkeypatch.setattr(crew_module, "Crew", FakeCrew)
+    monkeypatch.setattr(
+        crew_module,
+        "search_news",
+        lambda query, num: {"items": [], "note": "SERPER_API_KEY missing"},
+    )
+    crew = PropertyAnalysisCrew()
+
+    result = asyncio.run(crew.run_specialists(_listing(), ["news"]))
+
+    assert result.serper_missing is True
+    assert result.outputs["news"].score_1_to_100 == 50
+    assert result.raw_outputs["news"] == "Serper API key missing"
+
+
+@pytest.mark.parametrize(
+    ("serper_missing", "expected_overall"),
+    [
+        # (80*.30 + 60*.25 + 40*.20 + 72*.15) / .90 -> news weight dropped, rest renormalized
+        (True, 64),
+        # Same plus the neutral 50 news score at .10 -> unchanged full-weight mean
+        (False, 63),
+    ],
+)
+def test_build_final_report_drops_news_weight_when_serper_missing(
+    monkeypatch, serper_missing, expected_overall
+):
+    monkeypatch.setattr(crew_module, "Crew", FakeCrew)
+    crew = PropertyAnalysisCrew()
+    crew.weights = {
+        "investment": 0.30,
+        "location": 0.25,
+        "news": 0.10,
+        "vc_risk": 0.20,
+        "construction": 0.15,
+    }
+    scores = {"investment": 80, "location": 60, "news": 50, "vc_risk": 40, "construction": 72}
+    specialist_result = SpecialistResult(
+        outputs={key: AgentOutput(score_1_to_100=score, rationale="ok") for key, score in scores.items()},
+        raw_outputs={},
+        listing_details="",
+        location_details="",
+        news_context="",
+        serper_missing=serper_missing,
+    )
+
+    report = asyncio.run(crew.build_final_report(_listing(), specialist_result))
+
+    assert report.scores.overall == expected_overall
+    if not serper_missing:
+        assert report.scores.overall == weighted_overall(scores, crew.weights)
+
+
+def test_with_fresh_agents_isolates_agents_but_shares_cache(monkeypatch):
+    from src.app.llm_cache import MemoryCache
+
+    built = []
+
+    def fake_la_agent():
+        built.append(object())
+        return built[-1]
+
+    monkeypatch.setattr(crew_module, "create_la_property_agent", fake_la_agent)
+    crew = PropertyAnalysisCrew()
+    crew.llm_cache = MemoryCache()
+
+    clone = crew.with_fresh_agents()
+    other = crew.with_fresh_agents()
+
+    assert clone.investor_agent is not crew.investor_agent
+    assert clone.aggregator_agent is not crew.aggregator_agent
+    assert clone.llm_cache is crew.llm_cache
+    assert clone.weights == crew.weights
+    # The LA agent (and its Socrata session) is built once and shared by every copy
+    assert clone.la_property_agent is other.la_property_agent is crew.la_property_agent
+    assert len(built) == 1
+
+
+def test_analyze_listings_batch_bounds_concurrency_and_keeps_order(monkeypatch):
+    crew = PropertyAnalysisCrew()
+    in_flight = 0
+    peak = 0
+
+    async def fake_analyze(listing, enabled_agents=None):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        if listing.listing_id == "LN-3":
+            raise RuntimeError("boom")
+        return listing.listing_id
+
+    monkeypatch.setattr(crew, "analyze_listing", fake_analyze)
+    listings = [_listing().model_copy(update={"listing_id": f"LN-{i}"}) for i in range(6)]
+    seen = []
+
+    results = asyncio.run(
+        crew.analyze_listings_batch(
+            listings,
+            max_concurrency=2,
+            on_progress=lambda listing, result: seen.append(listing.listing_id),
+            return_exceptions=True,
+        )
+    )
+
+    assert peak == 2
+    assert results[:3] == ["LN-0", "LN-1", "LN-2"]
+    assert isinstance(results[3], RuntimeError)
+    assert results[4:] == ["LN-4", "LN-5"]
+    assert sorted(seen) == [f"LN-{i}" for i in range(6)]
+
+
+def test_analyze_listings_batch_gives_each_listing_its_own_agents(monkeypatch):
+    seen_agents = []
+
+    async def fake_analyze(self, listing, enabled_agents=None):
+        seen_agents.append(self.aggregator_agent)
+        await asyncio.sleep(0)
+        return listing.listing_id
+
+    monkeypatch.setattr(PropertyAnalysisCrew, "analyze_listing", fake_analyze)
+    crew = PropertyAnalysisCrew()
+    listings = [_listing().model_copy(update={"listing_id": f"LN-{i}"}) for i in range(3)]
+
+    asyncio.run(crew.analyze_listings_batch(listings, max_concurrency=3))
+
+    assert len({id(agent) for agent in seen_agents}) == 3
+    assert crew.aggregator_agent not in seen_agents
+
+
+def test_run_specialists_batch_maps_batch_output_back_to_listings(monkeypatch):
+    submitted = []
+
+    def fake_submit(requests):
+        submitted.extend(requests)
+        return "batch_123"
+
+    def fake_collect(batch_id, timeout=None):
+        assert timeout is not None
+        assert batch_id == "batch_123"
+        return {
+            "0:investment": json.dumps({"score_1_to_100": 70, "rationale": "a", "notes": []}),
+            "1:investment": json.dumps({"score_1_to_100": 40, "rationale": "b", "notes": []}),
+        }
+
+    monkeypatch.setattr(crew_module, "submit_batch", fake_submit)
+    monkeypatch.setattr(crew_module, "collect_batch", fake_collect)
+    crew = PropertyAnalysisCrew()
+    listings = [_listing(), _listing().model_copy(update={"listing_id": "LN-10"})]
+
+    results = asyncio.run(crew.run_specialists_batch(listings, ["investment", "location"]))
+
+    assert [item["custom_id"] for item in submitted] == [
+        "0:investment",
+        "0:location",
+        "1:investment",
+        "1:location",
+    ]
+    assert [r.outputs["investment"].score_1_to_100 for r in results] == [70, 40]
+    # Location answers were absent from the batch output -> neutral fallback
+    assert results[0].raw_outputs["location"] == "Agent output missing"
+    assert results[1].outputs["construction"].score_1_to_100 == 50
+
+
+def test_llm_cache_short_circuits_repeat_prompts(monkeypatch):
+    from src.app.llm_cache import MemoryCache
+
+    kickoffs = []
+
+    class CountingCrew(FakeCrew):
+        def kickoff(self):
+            kickoffs.append(self.agents[0].config["role"])
+            return super().kickoff()
+
+    monkeypatch.setattr(crew_module, "Crew", CountingCrew)
+    crew = PropertyAnalysisCrew()
+    crew.llm_cache = MemoryCache()
+
+    first = asyncio.run(crew.run_specialists(_listing(), ["investment", "location"]))
+    second = asyncio.run(crew.run_specialists(_listing(), ["investment", "location"]))
+
+    assert len(kickoffs) == 2
+    assert second.outputs["investment"] == first.outputs["investment"]
+    assert second.outputs["location"].score_1_to_100 == 64
@@ -0,0 +1,29 @@
+"""Tests for stored filter endpoints."""
+import json
+
+from fastapi.testclient import TestClient
+
+from src.main import app
+from src.app import filters as filter_store
+from src.app.models import SearchParams
+
+
+def test_get_filters_honours_etag(monkeypatch, tmp_path):
+    filters_file = tmp_path / "filters.json"
+    filters_file.write_text(json.dumps({"locationId": "41096", "size": 5}), encoding="utf-8")
+    monkeypatch.setattr(filter_store, "_FILTERS_FILE", filters_file)
+    client = TestClient(app)
+
+    first = client.get("/filters")
+    etag = first.headers["etag"]
+    assert first.json()["locationId"] == "41096"
+
+    cached = client.get("/filters", headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.content == b""
+
+    filter_store.save_filters(SearchParams(locationId="12345", size=10))
+    changed = client.get("/filters", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.json()["locationId"] == "12345"
+    assert changed.headers["etag"] != etag
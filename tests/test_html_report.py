@@ -0,0 +1,51 @@
+"""Tests for HTML report rendering helpers."""
+import pytest
+
+from src.app.html_report import _basic_markdown_to_html, generate_html_report, markdown_to_html
+from src.app.models import AgentOutput, AgentScores, FinalReport, Listing
+
+
+def test_basic_markdown_to_html_closes_headers_and_lists():
+    markdown = "## Summary\n\nSolid **cash flow**.\n\n### Risks\n- Deferred roof\n- Rent control\n\nEnd."
+
+    html = _basic_markdown_to_html(markdown)
+
+    assert "<h2>Summary</h2>" in html
+    assert "<strong>cash flow</strong>" in html
+    assert "<h3>Risks</h3>" in html
+    assert "<ul>\n<li>Deferred roof</li>\n<li>Rent control</li>\n</ul>" in html
+    assert html.endswith("<p>End.</p>")
+
+
+def test_markdown_to_html_escapes_raw_html():
+    pytest.importorskip("markdown_it")
+
+    html = markdown_to_html("**Note:** <script>alert(1)</script>")
+
+    assert "<strong>Note:</strong>" in html
+    assert "<script>" not in html
+
+
+def test_generate_html_report_escapes_listing_and_agent_text(tmp_path):
+    listing = Listing(listing_id="LN-1", address="1 <b>Main</b> St", ask_price=1_250_000, cap_rate=5.5)
+    report = FinalReport(
+        listing_id="LN-1",
+        address=listing.address,
+        scores=AgentScores(
+            investment=80, location=60, news_signal=50, risk_return=30, construction=70, overall=62
+        ),
+        memo_markdown="## Memo",
+        investment_output=AgentOutput(
+            score_1_to_100=80, rationale="Cash flow <script>x()</script>", notes=["A & B"]
+        ),
+    )
+    output_path = tmp_path / "report.html"
+
+    generate_html_report(report, listing, output_path)
+
+    html = output_path.read_text(encoding="utf-8")
+    assert "<script>" not in html
+    assert "Cash flow &lt;script&gt;x()&lt;/script&gt;" in html
+    assert "<li>A &amp; B</li>" in html
+    assert "1 &lt;b&gt;Main&lt;/b&gt; St" in html
+    assert "$1.25M" in html
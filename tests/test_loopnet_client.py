@@ -0,0 +1,121 @@
+"""Tests for LoopNetClient pagination helpers."""
+import asyncio
+
+import pytest
+
+from src.app.loopnet_client import LoopNetClient
+from src.app.models import Listing, SearchParams
+
+
+def test_search_paged_splits_large_sizes_into_concurrent_pages(monkeypatch):
+    requested = []
+
+    async def fake_search(self, params, city_name=None):
+        requested.append((params.page, params.size, city_name))
+        offset = (params.page - 1) * params.size
+        return [Listing(listing_id=f"LN-{offset + i}") for i in range(params.size)]
+
+    monkeypatch.setattr(LoopNetClient, "search_properties", fake_search)
+    client = LoopNetClient(api_key="test-rapid")
+
+    listings = asyncio.run(client.search_paged(SearchParams(page=2, size=30), page_size=20))
+
+    # Results 30..59 span upstream pages 2-3 of size 20
+    assert sorted(requested) == [(2, 20, None), (3, 20, None)]
+    assert [listing.listing_id for listing in listings] == [f"LN-{i}" for i in range(30, 60)]
+
+
+def test_search_paged_passes_small_sizes_through(monkeypatch):
+    requested = []
+
+    async def fake_search(self, params, city_name=None):
+        requested.append(params)
+        return []
+
+    monkeypatch.setattr(LoopNetClient, "search_properties", fake_search)
+    params = SearchParams(size=10)
+
+    asyncio.run(LoopNetClient(api_key="test-rapid").search_paged(params))
+
+    assert requested == [params]
+
+
+@pytest.mark.parametrize(
+    ("raw", "expected"),
+    [
+        ("$1.699M", 1_699_000),
+        ("$2.35m", 2_350_000),
+        ("$2.5MM", 2_500_000),
+        ("$850K", 850_000),
+        ("1,250,000", 1_250_000),
+        (" $ 975,000 ", 975_000),
+        (1_500_000, 1_500_000),
+        (2.5, 2.5),
+        ("$1.2M - $3M", None),
+        ("Upon Request", None),
+        ("1.2.3", None),
+        ("", None),
+        (None, None),
+    ],
+)
+def test_parse_price(raw, expected):
+    assert LoopNetClient._parse_price(raw) == pytest.approx(expected)
+
+
+@pytest.mark.parametrize(
+    ("raw", "expected"),
+    [
+        ("5.72%", 5.72),
+        (" 5.72 % ", 5.72),
+        ("6", 6.0),
+        (7.1, 7.1),
+        ("-0.5%", -0.5),
+        ("N/A", None),
+        ("5.72% - 6%", None),
+        ("", None),
+        (None, None),
+    ],
+)
+def test_parse_percentage(raw, expected):
+    assert LoopNetClient._parse_percentage(raw) == pytest.approx(expected)
+
+
+def test_parse_listings_reads_short_property_facts():
+    item = {
+        "listingId": "30001234",
+        "title": ["1200 W 7th St", "Los Angeles, CA 90017"],
+        "price": "$4.25M",
+        "shortPropertyFacts": [
+            ["Multifamily", "Built in 1962", "6.1%"],
+            [["24", "Units", "18,500", "SF Bldg"], ["5.8%", "Cap Rate"]],
+            "ignored top-level string",
+        ],
+    }
+
+    [listing] = LoopNetClient(api_key="test-rapid")._parse_listings({"data": [item]})
+
+    assert listing.listing_id == "30001234"
+    assert (listing.city, listing.state, listing.zip_code) == ("Los Angeles", "CA", "90017")
+    assert listing.ask_price == pytest.approx(4_250_000)
+    assert listing.units == 24
+    assert listing.building_size == pytest.approx(18_500)
+    assert listing.year_built == 1962
+    # The nested "Cap Rate" pair comes later and wins over the bare "6.1%" string
+    assert listing.cap_rate == pytest.approx(5.8)
+
+
+@pytest.mark.parametrize(
+    ("facts", "expected"),
+    [
+        ([], {}),
+        ([["8.0% Cap"]], {}),
+        ([["Built in 1985"]], {"year_built": 1985}),
+        ([[["Units"]]], {}),
+        ([[["n/a", "Units", 3, "SF Bldg"]]], {"building_size": 3.0}),
+        ([[["4", "Units"]], [["6", "Units"]]], {"units": 6}),
+    ],
+)
+def test_extract_facts_edge_cases(facts, expected):
+    empty = {"cap_rate": None, "units": None, "building_size": None, "year_built": None}
+
+    assert LoopNetClient._extract_facts(facts) == {**empty, **expected}
@@ -0,0 +1,71 @@
+"""Tests for the Serper news client's disk cache."""
+from __future__ import annotations
+
+import pytest
+
+from src.app import serper_news
+from src.app.config import settings
+
+
+@pytest.fixture
+def news_cache(monkeypatch, tmp_path):
+    """Point the news cache at a temp file and count network fetches."""
+    monkeypatch.setenv("SERPER_API_KEY", "test-serper")
+    monkeypatch.setattr(settings, "news_cache_ttl", 3600)
+    monkeypatch.setattr(settings, "news_cache_path", str(tmp_path / "news.sqlite3"))
+    monkeypatch.setattr(serper_news, "_cache_failed", False)
+    serper_news._news_cache.cache_clear()
+    calls: list[str] = []
+    responses = {"default": {"items": [{"title": "Zoning update"}]}}
+
+    def fake_fetch(api_key, query, num):
+        calls.append(query)
+        return responses.get(query, responses["default"])
+
+    monkeypatch.setattr(serper_news, "_fetch_news", fake_fetch)
+    yield calls, responses
+    serper_news._news_cache.cache_clear()
+
+
+def test_search_news_caches_successful_responses(news_cache):
+    calls, _ = news_cache
+
+    first = serper_news.search_news("Austin retail", 5)
+    second = serper_news.search_news("Austin retail", 5)
+
+    assert first == second == {"items": [{"title": "Zoning update"}]}
+    assert calls == ["Austin retail"]
+
+
+def test_search_news_misses_on_different_query_or_count(news_cache):
+    calls, _ = news_cache
+
+    serper_news.search_news("Austin retail", 5)
+    serper_news.search_news("Austin retail", 8)
+    serper_news.search_news("Dallas office", 5)
+
+    assert calls == ["Austin retail", "Austin retail", "Dallas office"]
+
+
+def test_search_news_does_not_cache_error_notes(news_cache):
+    calls, responses = news_cache
+    responses["Austin retail"] = {"items": [], "note": "Serper error 503"}
+
+    assert serper_news.search_news("Austin retail", 5)["note"] == "Serper error 503"
+    serper_news.search_news("Austin retail", 5)
+
+    assert calls == ["Austin retail", "Austin retail"]
+
+
+def test_search_news_falls_back_to_network_when_cache_unwritable(news_cache, monkeypatch, tmp_path):
+    calls, _ = news_cache
+    blocker = tmp_path / "not-a-dir"
+    blocker.write_text("", encoding="utf-8")
+    monkeypatch.setattr(settings, "news_cache_path", str(blocker / "news.sqlite3"))
+    serper_news._news_cache.cache_clear()
+
+    assert serper_news.search_news("Austin retail", 5) == {"items": [{"title": "Zoning update"}]}
+    serper_news.search_news("Austin retail", 5)
+
+    assert calls == ["Austin retail", "Austin retail"]
+    assert serper_news._cache_failed is True